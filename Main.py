@@ -1,36 +1,196 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+"""Kommandozeile: Kontrapunkte zu einem oder vielen Chorälen erzeugen, exportieren und abspielen.
+
+Choräle werden als JSON-Zeilen aus Dateien oder von stdin (`-`) gelesen, je Zeile
+entweder eine Notenliste `[[53, 4], [55, 2], ...]` oder ein Objekt
+`{"name": "...", "noten": [[53, 4], ...]}` (Pitch als MIDI-Nummer, Dauer in Achteln).
+Ohne Eingabe wird AppConfig.wWIHNS_1 verwendet.
+
+Jedes Ergebnis wird als JSON-Zeile auf stdout ausgegeben, sobald es fertig ist;
+gescheiterte Läufe erscheinen mit `"status": "error"` und Meldung unter `"fehler"`
+(Exit-Code 1). Meldungen und Diagnoseausgaben gehen auf stderr.
+
+Aufrufbeispiele:
+  python3 Main.py
+  python3 Main.py --headless --count 10 --jobs 4 --seed 1
+  python3 Main.py --headless --engine beam --count 5 --beam-width 32
+  python3 Main.py korpus.jsonl --no-playback --format mid --out-dir Ausgabe
+  cat korpus.jsonl | python3 Main.py - --no-playback --no-export
+"""
+
+import argparse
+import json
+import re
+import sys
 from pathlib import Path
+from typing import Iterator
 
+from a_domain.Melodie import Melodie
+from a_domain.Tonleitern import f_dur
 from c_adapters.Controller import TwoPartCounterpointController
 from c_adapters.config import AppConfig
 from c_adapters.FileSystemAdapter import FileSystemAdapter
 from c_adapters.MuseScoreXmlAdapter import MuseScoreXmlAdapter
 from b_application.generate_counterpoint_use_case import GenerateCounterpointUseCase
+from b_application.forward_checking_use_case import GenerateCounterpointForwardCheckingUseCase
+from b_application.beam_search_use_case import GenerateCounterpointBeamSearchUseCase
 from b_application.build_note_events_use_case import BuildNoteEventsUseCase
+from b_application.generate_batch_use_case import STATUS_ERROR, CounterpointRun
+from b_application.search_budget import SearchBudget
 from b_application.use_case_interactor import UseCaseInteractor
-from d_frameworks_drivers.musescore.exporter import MuseScoreFileExporter
-from d_frameworks_drivers.midiFluidSynth.driver import FluidSynthPlaybackDriver
-from d_frameworks_drivers.musescore.config import MuseScoreConfig
+from d_frameworks_drivers.ausgabepfade import new_run_id
 
+# Zeichen, die in Dateinamen durch "_" ersetzt werden
+_UNZULAESSIG = re.compile(r"[^\w.-]+")
+
+ENGINES = {
+    "classic": GenerateCounterpointUseCase,
+    "forward": GenerateCounterpointForwardCheckingUseCase,
+    "beam": GenerateCounterpointBeamSearchUseCase,
+}
+
+
+def _parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Zweistimmige Kontrapunkte erzeugen, exportieren und abspielen")
+    p.add_argument("inputs", nargs="*", help="JSON-Lines-Dateien mit Chorälen ('-' = stdin); ohne Angabe wWIHNS_1")
+    p.add_argument("--count", type=int, default=1,
+                   help="Kontrapunkte je Choral (Default: 1); bei beam die besten aus einem Durchgang")
+    p.add_argument("--jobs", type=int, default=1, help="Parallele Worker-Prozesse (Default: 1, nicht bei beam)")
+    p.add_argument("--seed", type=int, help="Basis-Seed für reproduzierbare Läufe")
+    p.add_argument("--engine", choices=sorted(ENGINES), default="classic",
+                   help="Suchverfahren: classic (Backtracking), forward (Vorwärtsprüfung) "
+                        "oder beam (beste Kontrapunkte per Beam-Suche)")
+    p.add_argument("--beam-width", type=int, default=8,
+                   help="Teil-Kontrapunkte je Zählzeit bei beam (Default: 8, mindestens --count)")
+    p.add_argument("--max-seconds", type=float, help="Zeitbudget je Lauf in Sekunden (nur classic)")
+    p.add_argument("--max-backtracks", type=int, help="Höchstzahl zurückgenommener Noten je Lauf (nur classic)")
+    p.add_argument("--max-calls", type=int, help="Höchstzahl get_contra-Aufrufe je Lauf (nur classic)")
+    p.add_argument("--partial", action="store_true",
+                   help="Bei erschöpftem Budget nur den Anfang ausgeben statt mit gelockerten Regeln "
+                        "zu ergänzen (nur classic)")
+    p.add_argument("--format", choices=("mscx", "mid"), default="mscx", help="Exportformat (Default: mscx)")
+    p.add_argument("--out-dir", help="Ausgabeverzeichnis (Default: Kontrapunkte/)")
+    p.add_argument("--no-export", action="store_true", help="Keine Dateien schreiben")
+    p.add_argument("--no-playback", action="store_true", help="Nicht abspielen")
+    p.add_argument("--headless", action="store_true",
+                   help="Wie --no-playback; Audio-Driver werden nicht geladen")
+    return p
+
+
+def _budget_optionen(args: argparse.Namespace) -> list[str]:
+    """Namen der gesetzten Budget-Optionen (wirken nur bei classic)."""
+    gesetzt = {
+        "--max-seconds": args.max_seconds is not None,
+        "--max-backtracks": args.max_backtracks is not None,
+        "--max-calls": args.max_calls is not None,
+        "--partial": args.partial,
+    }
+    return [name for name, aktiv in gesetzt.items() if aktiv]
+
+
+def _note(pitch, dauer) -> tuple[int, int]:
+    """Prüft eine Note aus der Eingabe: MIDI-Pitch 0-127 und positive Dauer in Achteln (Ticks)."""
+    if not isinstance(pitch, int) or isinstance(pitch, bool) or not 0 <= pitch <= 127:
+        raise ValueError(f"ungültige Tonhöhe {pitch!r} (erwartet: ganze Zahl 0-127)")
+    if not isinstance(dauer, int) or isinstance(dauer, bool) or dauer <= 0:
+        raise ValueError(f"ungültige Dauer {dauer!r} (erwartet: positive ganze Zahl)")
+    return pitch, dauer
+
+
+def _chorale_lesen(quellen: list[str], fehler: list[str]) -> Iterator[tuple[str, Melodie]]:
+    """Liest Choräle lazy aus JSON-Lines-Quellen; fehlerhafte Zeilen landen in `fehler`."""
+    for quelle in quellen:
+        stamm = "stdin" if quelle == "-" else Path(quelle).stem
+        datei = sys.stdin if quelle == "-" else open(quelle, encoding="utf-8")
+        try:
+            for nr, zeile in enumerate(datei, start=1):
+                zeile = zeile.strip()
+                if not zeile or zeile.startswith("#"):
+                    continue
+                try:
+                    daten = json.loads(zeile)
+                    name = f"{stamm}-{nr}"
+                    if isinstance(daten, dict):
+                        name = str(daten.get("name", name))
+                        daten = daten["noten"]
+                    noten = [_note(pitch, dauer) for pitch, dauer in daten]
+                    if len(noten) < 2:
+                        raise ValueError("ein Choral braucht mindestens zwei Noten")
+                except (ValueError, KeyError, TypeError) as e:
+                    fehler.append(f"{quelle}:{nr}")
+                    print(f"{quelle}:{nr}: Zeile übersprungen ({e})", file=sys.stderr)
+                    continue
+                yield name, Melodie(noten, f_dur)
+        finally:
+            if datei is not sys.stdin:
+                datei.close()
+
+
+def _score_exporter(fmt: str, base: Path, app_cfg: AppConfig, fs: FileSystemAdapter, out_dir: str | None):
+    # Nur das gewählte Exportformat wird importiert
+    if fmt == "mid":
+        from d_frameworks_drivers.midiFile.config import MidiFileConfig
+        from d_frameworks_drivers.midiFile.exporter import MidiFileExporter
+
+        midi_cfg = MidiFileConfig()
+        if out_dir:
+            midi_cfg.out_dirname = out_dir
+        return MidiFileExporter(project_root=base, app_cfg=app_cfg, midi_cfg=midi_cfg, fs=fs)
+
+    from d_frameworks_drivers.musescore.config import MuseScoreConfig
+    from d_frameworks_drivers.musescore.exporter import MuseScoreFileExporter
 
-def main() -> int:
-    base = Path(__file__).resolve().parent
-    app_cfg = AppConfig()
     ms_cfg = MuseScoreConfig()
+    if out_dir:
+        ms_cfg.out_dirname = out_dir
+    return MuseScoreFileExporter(project_root=base, app_cfg=app_cfg, ms_cfg=ms_cfg, fs=fs, xml=MuseScoreXmlAdapter())
 
-    # Adapter/Driver für MuseScore-Export (alle Abhängigkeiten hier gebaut)
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.engine != "classic" and _budget_optionen(args):
+        parser.error(f"{', '.join(_budget_optionen(args))} wirkt nur mit --engine classic")
+    if args.engine == "beam" and args.jobs != 1:
+        parser.error("--jobs wirkt nicht mit --engine beam (ein Suchdurchgang je Choral)")
+    if args.count < 1 or args.jobs < 1 or args.beam_width < 1:
+        print("--count, --jobs und --beam-width müssen >= 1 sein", file=sys.stderr)
+        return 2
+    playback = not (args.no_playback or args.headless)
+
+    base = Path(__file__).resolve().parent
+    app_cfg = AppConfig()
     fs = FileSystemAdapter(base)
-    xml = MuseScoreXmlAdapter()
-    score_exporter = MuseScoreFileExporter(project_root=base, app_cfg=app_cfg, ms_cfg=ms_cfg, fs=fs, xml=xml)
-    # Playback-Driver (FluidSynth) – nutzt Default-Konfiguration
-    playback_driver = FluidSynthPlaybackDriver(project_root=base)
+    score_exporter = None if args.no_export else _score_exporter(args.format, base, app_cfg, fs, args.out_dir)
+
+    # Playback-Driver (FluidSynth) – erst importiert, wenn Wiedergabe gewünscht ist
+    playback_driver = None
+    if playback:
+        from d_frameworks_drivers.midiFluidSynth.driver import FluidSynthPlaybackDriver
+
+        playback_driver = FluidSynthPlaybackDriver(project_root=base)
 
     # Application-Use-Cases und Interactor
-    generate_uc = GenerateCounterpointUseCase()
+    if args.engine == "classic":
+        # Ohne Budget-Optionen wird nie gelockert: ohne Lösung scheitert der Lauf mit "error"
+        budget = None
+        if _budget_optionen(args):
+            budget = SearchBudget(
+                max_seconds=args.max_seconds, max_backtracks=args.max_backtracks,
+                max_get_contra_calls=args.max_calls, relax=not args.partial,
+            )
+        generate_uc = GenerateCounterpointUseCase(budget=budget)
+    elif args.engine == "beam":
+        generate_uc = GenerateCounterpointBeamSearchUseCase(breite=args.beam_width)
+    else:
+        generate_uc = ENGINES[args.engine]()
     sequencer = BuildNoteEventsUseCase()
-    interactor = UseCaseInteractor(generate_uc=generate_uc, sequencer=sequencer)
+    interactor = UseCaseInteractor(
+        generate_uc=generate_uc, sequencer=sequencer,
+        beam_uc=generate_uc if args.engine == "beam" else None,
+    )
 
     ctrl = TwoPartCounterpointController(
         config=app_cfg,
@@ -39,16 +199,73 @@ def main() -> int:
         interactor=interactor,
     )
 
-    # 1) Domänenobjekte aufbauen
-    choral = ctrl.build_choral()
-    kontrapunkt = ctrl.generate_counterpoint(choral)
+    fehler: list[str] = []
+    if args.inputs:
+        chorale = _chorale_lesen(args.inputs, fehler)
+    else:
+        chorale = iter([("wWIHNS_1", ctrl.build_choral())])
+    # Choräle im Hauptprozess für Export und Wiedergabe vorhalten, bis alle ihre Läufe fertig sind.
+    # Schlüssel ist (laufende Nummer, Name), damit doppelte Namen nicht kollidieren.
+    offen: dict[tuple[int, str], list] = {}
+
+    def merken(strom: Iterator[tuple[str, Melodie]]) -> Iterator[tuple[tuple[int, str], Melodie]]:
+        for nr, (name, choral) in enumerate(strom):
+            offen[(nr, name)] = [choral, args.count]
+            yield (nr, name), choral
+
+    def beste(strom: Iterator[tuple[tuple[int, str], Melodie]]) -> Iterator[tuple[tuple[int, str], CounterpointRun]]:
+        # Ein Durchgang je Choral; gibt es weniger Lösungen als --count, wird der Choral früher freigegeben
+        for schluessel, runs in ctrl.generate_top_corpus(strom, args.count, seed=args.seed):
+            offen[schluessel][1] = len(runs)
+            for run in runs:
+                yield schluessel, run
+
+    if args.engine == "beam":
+        laeufe = beste(merken(chorale))
+    else:
+        laeufe = ctrl.generate_corpus(merken(chorale), args.count, workers=args.jobs, seed=args.seed)
 
-    # 2) Export
-    ctrl.export_musescore(kontrapunkt)
+    # Eine Lauf-ID für alle Dateien dieses Aufrufs (Exporter erzeugen sonst je Aufruf eine neue)
+    run_id = new_run_id()
 
-    # 3) Wiedergabe
-    ctrl.playback_realtime(choral, kontrapunkt)
-    return 0
+    try:
+        for schluessel, run in laeufe:
+            eintrag = offen[schluessel]
+            choral = eintrag[0]
+            eintrag[1] -= 1
+            if eintrag[1] == 0:
+                del offen[schluessel]
+            nr, name = schluessel
+            if run.status == STATUS_ERROR:
+                fehler.append(f"{name}#{run.index}")
+                print(json.dumps({
+                    "choral": name,
+                    "index": run.index,
+                    "seed": run.seed,
+                    "status": run.status,
+                    "fehler": run.fehler,
+                }), flush=True)
+                continue
+            pfad = None
+            if score_exporter is not None:
+                datei_key = f"{nr:05d}_{_UNZULAESSIG.sub('_', name)}_{run.index:03d}"
+                pfad = ctrl.export_score(choral, run.kontrapunkt, run_id=run_id, key=datei_key)
+            print(json.dumps({
+                "choral": name,
+                "index": run.index,
+                "seed": run.seed,
+                "status": run.status,
+                "kontrapunkt": run.kontrapunkt.notenliste,
+                "pfad": str(pfad) if pfad is not None else None,
+                "sekunden": round(run.stats.total_seconds, 6),
+                "backtrack_pops": run.stats.backtrack_pops,
+            }), flush=True)
+            if playback_driver is not None:
+                ctrl.playback_realtime(choral, run.kontrapunkt)
+    finally:
+        if playback_driver is not None:
+            playback_driver.close()
+    return 1 if fehler else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Synthetische Cantus firmi für Last- und Skalierungstests.
+
+Erzeugt Choräle als Notenliste [(MIDI-Pitch, Dauer in Achteln), ...] aus den
+Tönen der Tonleiter innerhalb eines Ambitus. Melodieschritte halten sich an
+KpRegeln.melodie_intervall_erlaubt, die Gesamtgestalt folgt einer wählbaren
+Kontur, und jeder Choral endet mit einer Klausel (Tenor: Ganzton abwärts in den
+Schlusston, Sopran: Halbton aufwärts), wie sie get_contra voraussetzt. Welche
+Töne die Klausel noch regelkonform erreichen können, wird vorab vom Schluss her
+bestimmt; die Melodie läuft damit nie in einen unerlaubten Sprung.
+"""
+
+import math
+import random
+from itertools import count
+
+from .KpRegeln import KpRegeln
+from .Tonleitern import f_dur
+
+
+class ChoralGenerator(object):
+    KONTUREN = ("bogen", "wellen", "steigend", "fallend", "zufall")
+    KLAUSELN = ("tenor", "sopran")
+
+    def __init__(self, anzahl_noten=33, rhythmus=None, kontur="bogen", klausel="tenor",
+                 schlusston=53, klauseldauer=4, schlussdauer=8, ambitus=(48, 60), tonleiter=f_dur, rng=None):
+        if anzahl_noten < 3:
+            raise ValueError("Ein Choral braucht mindestens drei Noten (Anfang + Klausel).")
+        if kontur not in self.KONTUREN:
+            raise ValueError(f"Unbekannte Kontur '{kontur}', erlaubt: {', '.join(self.KONTUREN)}")
+        if klausel not in self.KLAUSELN:
+            raise ValueError(f"Unbekannte Klausel '{klausel}', erlaubt: {', '.join(self.KLAUSELN)}")
+        self.anzahl_noten = anzahl_noten
+        # Dauer in Achteln -> relatives Gewicht (Standard angelehnt an wWIHNS_1)
+        self.rhythmus = dict(rhythmus or {2: 3, 4: 4, 8: 1})
+        self.kontur = kontur
+        self.klausel = klausel
+        self.schlusston = schlusston
+        # Feste Dauern der Klausel (wie in wWIHNS_1: Halbe + Ganze)
+        self.klauseldauer = klauseldauer
+        self.schlussdauer = schlussdauer
+        self.tonleiter = tonleiter
+        self.rng = rng or random
+
+        self.toene = [t for t in tonleiter[1:] if ambitus[0] <= t <= ambitus[1]]
+        self.vorletzter_ton = schlusston + 2 if klausel == "tenor" else schlusston - 1
+        for ton in (self.schlusston, self.vorletzter_ton):
+            if ton not in tonleiter:
+                raise ValueError(f"Klauselton {ton} liegt nicht in der Tonleiter.")
+
+    # --- Gestalt ---
+    def _zielton(self, anteil):
+        """Zielhöhe der Kontur an relativer Position `anteil` (0..1)."""
+        tief, hoch = self.toene[0], self.toene[-1]
+        if self.kontur == "bogen":
+            hoehe = math.sin(math.pi * anteil)
+        elif self.kontur == "wellen":
+            hoehe = 0.5 + 0.5 * math.sin(3 * math.pi * anteil)
+        elif self.kontur == "steigend":
+            hoehe = anteil
+        elif self.kontur == "fallend":
+            hoehe = 1.0 - anteil
+        else:
+            return None
+        return tief + hoehe * (hoch - tief)
+
+    def _erreichbar(self, frei):
+        """Je freier Position die Töne, von denen aus die Klausel noch erreichbar ist (None = alle).
+
+        Rückwärts vom vorletzten Ton: Position i braucht einen erlaubten Schritt
+        zu einem Ton, der an Position i + 1 erlaubt ist.
+        """
+        erlaubt = [None] * frei
+        ziele = {self.vorletzter_ton}
+        for i in range(frei - 1, -1, -1):
+            toene = {
+                t for t in self.toene
+                if any(KpRegeln.melodie_intervall_erlaubt(z - t) for z in ziele)
+            }
+            if not toene:
+                raise ValueError("Im Ambitus gibt es keinen Weg in die Klausel.")
+            if len(toene) == len(self.toene):
+                break  # ab hier ist jeder Ton möglich
+            erlaubt[i] = ziele = toene
+        return erlaubt
+
+    def _naechster_ton(self, ton, anteil, erlaubt=None):
+        kandidaten = []
+        gewichte = []
+        ziel = self._zielton(anteil)
+        for t in self.toene:
+            intervall = t - ton
+            if not KpRegeln.melodie_intervall_erlaubt(intervall):
+                continue
+            if erlaubt is not None and t not in erlaubt:
+                continue
+            # Schritte bevorzugen, Sprünge seltener, Tonwiederholung kaum
+            abstand = abs(intervall)
+            gewicht = 0.2 if abstand == 0 else (4.0 if abstand <= 2 else (1.0 if abstand <= 5 else 0.3))
+            if ziel is not None:
+                gewicht /= 1.0 + abs(t - ziel) / 2.0
+            kandidaten.append(t)
+            gewichte.append(gewicht)
+        if not kandidaten:
+            # Kann nicht eintreten: jeder Ton aus `erlaubt` hat einen erlaubten Folgeton
+            raise ValueError(f"Kein erlaubter Folgeton zu {ton}.")
+        return self.rng.choices(kandidaten, weights=gewichte)[0]
+
+    def _dauer(self):
+        dauern = list(self.rhythmus)
+        return self.rng.choices(dauern, weights=[self.rhythmus[d] for d in dauern])[0]
+
+    # --- Erzeugung ---
+    def erzeugen(self):
+        """Erzeugt einen Choral als Notenliste."""
+        frei = self.anzahl_noten - 2
+        erlaubt = self._erreichbar(frei)
+        anfang = [t for t in self.toene if erlaubt[0] is None or t in erlaubt[0]]
+        ton = self.schlusston if self.schlusston in anfang else self.rng.choice(anfang)
+        noten = [(ton, self._dauer())]
+        for i in range(1, frei):
+            ton = self._naechster_ton(ton, i / max(1, frei - 1), erlaubt[i])
+            noten.append((ton, self._dauer()))
+        noten.append((self.vorletzter_ton, self.klauseldauer))
+        noten.append((self.schlusston, self.schlussdauer))
+        return noten
+
+    def strom(self, anzahl=None, seed=None):
+        """Liefert lazy `anzahl` Choräle (ohne Angabe unbegrenzt viele).
+
+        Jeder Choral erhält einen eigenen, aus `seed` abgeleiteten Zufallsgenerator;
+        die Folge ist damit reproduzierbar, ohne dass Choräle vorgehalten werden.
+        """
+        quelle = random.Random(seed)
+        zaehler = count() if anzahl is None else range(anzahl)
+        for _ in zaehler:
+            einzel = ChoralGenerator(
+                anzahl_noten=self.anzahl_noten, rhythmus=self.rhythmus, kontur=self.kontur,
+                klausel=self.klausel, schlusston=self.schlusston, klauseldauer=self.klauseldauer,
+                schlussdauer=self.schlussdauer, ambitus=(self.toene[0], self.toene[-1]),
+                tonleiter=self.tonleiter, rng=random.Random(quelle.getrandbits(64)),
+            )
+            yield einzel.erzeugen()
@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from random import randint
+import random
 
 
 class HarmonischeStruktur(object):
-    def __init__(self, choral, kontrapunkt):
+    def __init__(self, choral, kontrapunkt, rng=None):
         self.interval_qualities = []
         self.choral = choral
         self.kontrapunkt = kontrapunkt
+        # Zufallsquelle (z. B. random.Random(seed)); ohne Angabe der globale Generator.
+        self.rng = rng or random
 
     def get_interval(self, note1, note2):
         # hier fehlen u.U. später Begriffe wie "vermindert" & "übermäßig"
@@ -58,7 +60,7 @@ class HarmonischeStruktur(object):
         return erlaubte_notenlaenge
 
     def notenlaenge_waehlen(self, liste):
-        return liste[randint(0, len(liste) - 1)]
+        return liste[self.rng.randint(0, len(liste) - 1)]
 
     def genau_ein_ton_liegt(self, position_im_stueck):
         # schaut, ob in genau einer Stimme der Ton gerade NICHT beginnt
@@ -1,15 +1,28 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from random import randint
+import random
+
 from .Tonleitern import c_dur, f_dur
 
 
 class KpRegeln(object):
-    def __init__(self, harmonie, choral, kontrapunkt):
+    # Kompilierte Kandidatentabellen. Die Regeln hängen nur von den beteiligten Tönen ab,
+    # daher werden die Ergebnisse prozessweit geteilt. Bit i einer Maske steht für f_dur[i].
+    _basis_masken = {}  # (midipitch_1, lastMidipitch_2) -> Maske
+    _abwaerts_masken = {}  # lastMidipitch_2 -> Maske (Auflösung 1-2 Halbtöne abwärts)
+    _kandidaten_je_maske = {}  # Maske -> Tupel der MIDI-Pitches
+
+    def __init__(self, harmonie, choral, kontrapunkt, rng=None):
         self.harmonie = harmonie
         self.choral = choral
         self.kontrapunkt = kontrapunkt
+        # Zufallsquelle (z. B. random.Random(seed)); ohne Angabe der globale Generator.
+        self.rng = rng or random
+        # Zulässige Kandidaten des letzten get_contra-Aufrufs (für Suchstatistiken)
+        self.letzte_kandidaten = ()
+        # Notenindizes im Kontrapunkt, von denen der letzte Fehlschlag abhing (für Backjumping)
+        self.letzter_konflikt = ()
 
     def mi_contra_fa(self, note_1, note_2):
         if (
@@ -28,13 +41,25 @@ class KpRegeln(object):
         else:
             return False
 
+    @staticmethod
+    def klauselton(choral_noten):
+        # Vorletzter Kontrapunktton der Schlussbildung. Ohne Tenor- oder Sopranklausel
+        # im Choral gibt es keinen regelkonformen Schluss.
+        if len(choral_noten) >= 2:
+            if choral_noten[-2][0] - choral_noten[-1][0] == 2:
+                return choral_noten[-1][0] + 11  # Tenorklausel im Choral -> Sopranklausel im Kontrapunkt
+            if choral_noten[-2][0] - choral_noten[-1][0] == -1:
+                return choral_noten[-1][0] + 14  # Sopranklausel im Choral -> Tenorklausel im Kontrapunkt
+        raise ValueError("Der Choral endet weder mit einer Tenor- noch mit einer Sopran-Klausel.")
+
     def halbe_Pausen_oder_groesser_erlaubt(self, taktposition):
         if taktposition == 0 or taktposition == 4:
             return True
         else:
             return False
 
-    def melodie_intervall_erlaubt(self, intervall):  # dies funktionert auch für negative Intervalle
+    @staticmethod
+    def melodie_intervall_erlaubt(intervall):  # dies funktionert auch für negative Intervalle
         moegliche_intervalle = [0, 1, 2, 3, 4, 5, 7, 12, 8]
         if intervall < 0:
             erlaubte_intervalle = moegliche_intervalle[:-1]
@@ -64,7 +89,7 @@ class KpRegeln(object):
         # schrittweise verlassen werden muss (Dissonanz, Exzerpt S. 3).
         # Es wird immer abwärts aufgelöst, deshalb ist die Richtung nicht zufällig (Exzerpt S. 4)
         # Jedoch kann sich die Stimme ausgesucht werden, die (abwärts) auflöst, deshalb hier der Zufall.
-        stimme = randint(1, 2)
+        stimme = self.rng.randint(1, 2)
         if stimme == 1:
             for i in range(0, len(f_dur), 1):
                 if f_dur[i] == midipitch_1:
@@ -77,87 +102,121 @@ class KpRegeln(object):
                     midipitch_2 = f_dur[i - 1]
         return midipitch_1, midipitch_2
 
-    def get_contra(self, position_im_stueck):
+    def _basis_maske(self, midipitch_1, lastMidipitch_2):
+        # Kandidaten, die zum Choralton konsonant sind, keinen Tritonus bilden
+        # und melodisch vom letzten Kontrapunktton aus erreichbar sind.
+        schluessel = (midipitch_1, lastMidipitch_2)
+        maske = self._basis_masken.get(schluessel)
+        if maske is None:
+            maske = 0
+            for i in range(1, len(f_dur)):
+                test_note = f_dur[i]
+                intervalQuality = self.harmonie.interval_quality(
+                    self.harmonie.get_interval(midipitch_1, test_note)
+                )
+                if (
+                    not self.mi_contra_fa(midipitch_1, test_note)
+                    and self.melodie_intervall_erlaubt(test_note - lastMidipitch_2)
+                    and intervalQuality == "Konsonanz"
+                ):
+                    maske |= 1 << i
+            self._basis_masken[schluessel] = maske
+        return maske
+
+    def _abwaerts_maske(self, lastMidipitch_2):
+        maske = self._abwaerts_masken.get(lastMidipitch_2)
+        if maske is None:
+            maske = 0
+            for i in range(1, len(f_dur)):
+                if lastMidipitch_2 - f_dur[i] in (1, 2):
+                    maske |= 1 << i
+            self._abwaerts_masken[lastMidipitch_2] = maske
+        return maske
+
+    def erlaubte_kandidaten(self, midipitch_1, lastMidipitch_2, last_interval_quality):
+        """Liefert alle zulässigen Kontrapunkttöne als Tupel (aus der kompilierten Tabelle).
+
+        Nach einer Dissonanz sind nur Töne erlaubt, die 1-2 Halbtöne abwärts auflösen.
+        """
+        maske = self._basis_maske(midipitch_1, lastMidipitch_2)
+        if last_interval_quality == "Dissonanz":
+            maske &= self._abwaerts_maske(lastMidipitch_2)
+        elif last_interval_quality != "Konsonanz":
+            maske = 0
+        kandidaten = self._kandidaten_je_maske.get(maske)
+        if kandidaten is None:
+            kandidaten = tuple(f_dur[i] for i in range(1, len(f_dur)) if maske >> i & 1)
+            self._kandidaten_je_maske[maske] = kandidaten
+        return kandidaten
+
+    def parallele_vorher(self):
+        # Verbotene Parallelführungen vermeiden: waren die letzten beiden Intervalle
+        # dieselbe perfekte Konsonanz (Prime, Quinte, Oktave), ist kein Ton zulässig.
+        qualities = self.harmonie.interval_qualities
+        return (
+            len(qualities) > 1
+            and qualities[-2][1] == qualities[-1][1]
+            and qualities[-1][1] in (0, 7, 12)
+        )
+
+    def parallele_noten(self):
+        # Kontrapunktnoten, die an den beiden letzten Intervallen beteiligt sind
+        return tuple(sorted({
+            self.kontrapunkt.get_aktuelleNotenNummer(position)
+            for position, _, _ in self.harmonie.interval_qualities[-2:]
+        }))
+
+    def get_contra(self, position_im_stueck, ausgeschlossen=()):
         # Herzfunktion get_contra sucht nach einem Ton, der im Kontrapunkt passt.
+        # `ausgeschlossen`: (Pitch, Dauer)-Paare, die an dieser Stelle schon gescheitert sind.
         midipitch_1 = self.choral.aktuelleNote(position_im_stueck)[0]
         lastMidipitch_2 = self.kontrapunkt.notenliste[-1][0]
-        testlist = f_dur[:]
         contra = 0
-        for i in range(1, len(testlist), 1):
-            test_note = testlist.pop(randint(1, len(testlist) - 1))
-            intervalQuality = self.harmonie.interval_quality(
-                self.harmonie.get_interval(midipitch_1, test_note)
-            )
-            if (
-                (self.mi_contra_fa(midipitch_1, test_note) == False)
-                and (self.melodie_intervall_erlaubt(test_note - lastMidipitch_2) == True)
-                and (intervalQuality == "Konsonanz")
-            ):
-                if (
-                    self.harmonie.interval_qualities[-1][2] == "Konsonanz"
-                    or (
-                        self.harmonie.interval_qualities[-1][2] == "Dissonanz"
-                        and (
-                            lastMidipitch_2 - test_note == 1
-                            or lastMidipitch_2 - test_note == 2
-                        )
-                    )
-                ):
-                    if len(self.harmonie.interval_qualities) > 1:
-                        # Wenn der letzte Ton Konsonanz bildete, oder zumindest der neue Ton nicht aus der Dissonanz herausspringt
-                        if (
-                            (
-                                (self.harmonie.interval_qualities[-2][1] == 0)
-                                and (self.harmonie.interval_qualities[-1][1] == 0)
-                            )
-                            == False
-                        ) and (
-                            (
-                                (self.harmonie.interval_qualities[-2][1] == 7)
-                                and (self.harmonie.interval_qualities[-1][1] == 7)
-                            )
-                            == False
-                        ) and (
-                            (
-                                (self.harmonie.interval_qualities[-2][1] == 12)
-                                and (self.harmonie.interval_qualities[-1][1] == 12)
-                            )
-                            == False
-                        ):
-                            # Verbotene Parallelführungen vermeiden
-                            contra = test_note
-                            break
-                    else:
-                        contra = test_note
-                        break
-
-        notenlaenge = self.harmonie.notenlaenge_waehlen(
-            self.harmonie.get_erlaubte_notenlaenge(
-                self.harmonie.get_taktposition(position_im_stueck)
-            )
+        kandidaten = self.erlaubte_kandidaten(
+            midipitch_1, lastMidipitch_2, self.harmonie.interval_qualities[-1][2]
         )
-        if (
-            position_im_stueck
-            >= self.choral.laenge()
-            - self.choral.notenliste[-2][1]
-            - self.choral.notenliste[-1][1]
-        ):
-            # Gestaltung der vorletzten Note
-            if (self.choral.notenliste[-2][0] - self.choral.notenliste[-1][0]) == 2:
-                vorletztes_intervall = 11
-            elif (self.choral.notenliste[-2][0] - self.choral.notenliste[1][0]) == -1:
-                vorletztes_intervall = 14
+        self.letzte_kandidaten = kandidaten
+        # Standard: der Fehlschlag hängt an der letzten Kontrapunktnote (Melodieschritt, Auflösung)
+        konflikt = (len(self.kontrapunkt.notenliste) - 1,)
+        parallele = self.parallele_vorher()
+        if parallele:
+            konflikt = self.parallele_noten()
+        erlaubte_notenlaengen = self.harmonie.get_erlaubte_notenlaenge(
+            self.harmonie.get_taktposition(position_im_stueck)
+        )
+        if ausgeschlossen:
+            # Gleichverteilt unter den noch nicht gescheiterten Paaren aus Ton und Dauer
+            paare = [
+                (ton, dauer) for ton in (kandidaten if not parallele else ())
+                for dauer in erlaubte_notenlaengen if (ton, dauer) not in ausgeschlossen
+            ]
+            if paare:
+                contra, notenlaenge = paare[self.rng.randint(0, len(paare) - 1)]
             else:
-                print("Der Choral endet weder mit einer Tenor- noch mit einer Sopran-Klausel.")
-            contra = self.choral.notenliste[-1][0] + vorletztes_intervall
-            notenlaenge = (
-                self.choral.laenge() - self.choral.notenliste[-1][1] - position_im_stueck
-            )
-        if position_im_stueck == self.choral.laenge() - self.choral.notenliste[-1][1]:
+                notenlaenge = erlaubte_notenlaengen[0]
+        else:
+            if kandidaten and not parallele:
+                # Gleichverteilte Wahl unter allen zulässigen Tönen (entspricht dem früheren
+                # Durchprobieren der Skala in zufälliger Reihenfolge).
+                contra = kandidaten[self.rng.randint(0, len(kandidaten) - 1)]
+            notenlaenge = self.harmonie.notenlaenge_waehlen(erlaubte_notenlaengen)
+        schlussnote = self.choral.laenge() - self.choral.notenliste[-1][1]
+        if position_im_stueck >= schlussnote - self.choral.notenliste[-2][1]:
+            # Gestaltung der vorletzten Note
+            contra = self.klauselton(self.choral.notenliste)
+            notenlaenge = schlussnote - position_im_stueck
+            konflikt = (len(self.kontrapunkt.notenliste) - 1,)
+        if position_im_stueck == schlussnote:
             # Gestaltung der letzten Note
             contra = midipitch_1 + 12
             notenlaenge = self.choral.notenliste[-1][1]
+        elif position_im_stueck > schlussnote:
+            # Die letzte Kontrapunktnote reicht über den Einsatz der Schlussnote hinaus
+            contra = 0
+        if (contra, notenlaenge) in ausgeschlossen:
+            contra = 0
         if contra == 0:
+            self.letzter_konflikt = konflikt
             print("get_contra konnte keine mögliche Note finden. Versuche vorher eine andere Note.")
             subtract = self.kontrapunkt.notenliste.pop(-1)[1]
             # löscht gleichzeitig das letzte Element & ergibt, wann position_im_stueck nochmal ansetzen muss.
@@ -166,4 +225,5 @@ class KpRegeln(object):
             position_im_stueck = position_im_stueck - subtract
             return False, contra, notenlaenge, position_im_stueck
         else:
+            self.letzter_konflikt = ()
             return True, contra, notenlaenge, position_im_stueck
@@ -1,9 +1,93 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from bisect import bisect_right
+from itertools import accumulate
+
 from .Tonleitern import c_dur, f_dur
 
 
+class Notenliste(list):
+    """Liste von (MIDI-Pitch, Dauer)-Tupeln mit kumulativem Einsatz-Index.
+
+    `_einsaetze[i]` ist die Zählzeit, an der Note i beginnt; `_einsaetze[-1]`
+    ist die Gesamtlänge. `append` und `pop` (am Ende) pflegen den Index
+    inkrementell, da sie im Such-/Backtracking-Verlauf ständig vorkommen.
+    Alle übrigen verändernden Operationen markieren ihn nur als veraltet;
+    er wird beim nächsten Zugriff einmalig neu aufgebaut.
+    """
+
+    def __init__(self, noten=()):
+        super().__init__(noten)
+        self._einsaetze = None
+
+    def __reduce__(self):
+        # Nur die Noten serialisieren; der Index wird beim Laden neu aufgebaut.
+        return (self.__class__, (list(self),))
+
+    def einsaetze(self):
+        if self._einsaetze is None:
+            self._einsaetze = [0, *accumulate(note[1] for note in self)]
+        return self._einsaetze
+
+    # --- inkrementell gepflegte Operationen ---
+    def append(self, note):
+        super().append(note)
+        if self._einsaetze is not None:
+            self._einsaetze.append(self._einsaetze[-1] + note[1])
+
+    def pop(self, index=-1):
+        am_ende = index == -1 or index == len(self) - 1
+        note = super().pop(index)
+        if am_ende and self._einsaetze is not None:
+            self._einsaetze.pop()
+        else:
+            self._einsaetze = None
+        return note
+
+    # --- alle weiteren Änderungen invalidieren den Index ---
+    def extend(self, noten):
+        super().extend(noten)
+        self._einsaetze = None
+
+    def insert(self, index, note):
+        super().insert(index, note)
+        self._einsaetze = None
+
+    def remove(self, note):
+        super().remove(note)
+        self._einsaetze = None
+
+    def clear(self):
+        super().clear()
+        self._einsaetze = None
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._einsaetze = None
+
+    def reverse(self):
+        super().reverse()
+        self._einsaetze = None
+
+    def __setitem__(self, index, wert):
+        super().__setitem__(index, wert)
+        self._einsaetze = None
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._einsaetze = None
+
+    def __iadd__(self, noten):
+        self.extend(noten)
+        return self
+
+    def __imul__(self, faktor):
+        super().__imul__(faktor)
+        self._einsaetze = None
+        return self
+
+
 class Melodie(object):
     def __init__(self, notenliste, tonart):
         self.notenliste = notenliste
@@ -11,22 +95,23 @@ class Melodie(object):
         self.neuesLokalesExtremum = ()
         self.letztesLokalesExtremum = ()
 
+    @property
+    def notenliste(self):
+        return self._notenliste
+
+    @notenliste.setter
+    def notenliste(self, noten):
+        # Jede zugewiesene Liste wird in eine indizierte Notenliste überführt.
+        self._notenliste = noten if isinstance(noten, Notenliste) else Notenliste(noten)
+
     def laenge(self):
-        laenge_der_melodie = 0
-        for i in range(0, len(self.notenliste), 1):
-            laenge_der_melodie += self.notenliste[i][1]
-        return laenge_der_melodie
+        return self._notenliste.einsaetze()[-1]
 
     def get_aktuelleNotenNummer(self, position_im_stueck):
-        if self.notenliste == []:
-            return 0  # Auch wenn die Liste noch leer ist, kann die Melodie eine Position haben.
-        else:
-            anzahl_zaehlzeiten = 0
-            for i in range(0, len(self.notenliste), 1):
-                anzahl_zaehlzeiten += self.notenliste[i][1]
-                if anzahl_zaehlzeiten > position_im_stueck:
-                    return i
-            return len(self.notenliste)
+        # Auch wenn die Liste noch leer ist, kann die Melodie eine Position haben (-> 0).
+        # Gesucht ist die erste Note, deren Ende hinter position_im_stueck liegt.
+        einsaetze = self._notenliste.einsaetze()
+        return bisect_right(einsaetze, position_im_stueck, 1) - 1
 
     def anzahl_zaehlzeiten_bis_zur_note(self, notennummer):
         if self.notenliste == []:
@@ -35,10 +120,7 @@ class Melodie(object):
             print("anzahl_zaehlzeiten_bis_zur_note hat eine zu große notennummer.")
             print("Durch die notennummer kann kein Element der notenliste erreicht werden.")
         else:
-            anzahl_zaehlzeiten = 0
-            for i in range(0, notennummer, 1):
-                anzahl_zaehlzeiten += self.notenliste[i][1]
-            return anzahl_zaehlzeiten
+            return self._notenliste.einsaetze()[notennummer]
 
     def aktuelleNote(self, position_im_stueck):
         nummer = self.get_aktuelleNotenNummer(position_im_stueck)
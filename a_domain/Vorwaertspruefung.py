@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Vorwärtsprüfung (Forward Checking) für die Kontrapunkt-Suche.
+
+Statt Töne blind zu setzen und bei einer Sackgasse Note für Note zurückzugehen,
+wird der Kontrapunkt als Folge von Zuständen (Einsatz, Ton) betrachtet. Für jedes
+Choral-Segment gibt es eine Tondomäne (konsonant, kein mi contra fa). Diese wird
+vom Schluss her rückwärts beschnitten: Ein Ton bleibt an einem Einsatz nur
+erhalten, wenn von ihm aus mindestens ein regelkonformer Übergang zu einem
+weiterhin machbaren Folgeton existiert. Geprüft werden dabei Konsonanz am
+Einsatz, erlaubte Melodieintervalle, Tritonus (mi contra fa), Quint-/Oktav-/
+Primparallelen und die abwärts schrittweise Auflösung von Dissonanzen.
+
+Nach der Prüfung kann jede Suche vom Anfang aus frei wählen, ohne je in eine
+Sackgasse zu laufen; der Aufwand ist linear in der Länge des Chorals.
+"""
+
+from bisect import bisect_right
+
+from .Tonleitern import f_dur
+
+
+class Vorwaertspruefung(object):
+    def __init__(self, choral, harmonie, regeln, tonleiter=f_dur):
+        noten = choral.notenliste
+        self.choral = choral
+        self.harmonie = harmonie
+        self.regeln = regeln
+        self.tonleiter = tonleiter
+        # Ohne Tenor- oder Sopranklausel gibt es keinen Schluss (ValueError wie in get_contra)
+        self.klauselton = regeln.klauselton(noten)
+
+        self.einsaetze = list(noten.einsaetze())
+        self.vorletzter_einsatz = self.einsaetze[-3]
+        self.letzter_einsatz = self.einsaetze[-2]
+        self.anfangston = noten[0][0] + 12
+        self.schlusston = noten[-1][0] + 12
+
+        toene = set(tonleiter[1:]) | {self.anfangston, self.schlusston, self.klauselton}
+        self._toene = sorted(toene)
+        # Melodisch erreichbare Folgetöne je Ton
+        self._melodisch = {
+            c: frozenset(c2 for c2 in self._toene if regeln.melodie_intervall_erlaubt(c2 - c))
+            for c in self._toene
+        }
+        # Tondomäne je Choral-Segment: Skalentöne, die konsonant und ohne Tritonus zum Choralton klingen
+        self._domaenen = [self._segment_domaene(pitch) for pitch, _ in noten]
+
+        self._machbar = self._rueckwaerts_pruefen()
+
+    # --- Regeln ---
+    def _klingt(self, choralton, ton):
+        return (
+            not self.regeln.mi_contra_fa(choralton, ton)
+            and self.harmonie.interval_quality(self.harmonie.get_interval(choralton, ton)) == "Konsonanz"
+        )
+
+    def _segment_domaene(self, choralton):
+        return frozenset(c for c in self.tonleiter[1:] if self._klingt(choralton, c))
+
+    def _notennummer(self, einsatz):
+        return bisect_right(self.einsaetze, einsatz, 1) - 1
+
+    def _dauern(self, einsatz):
+        return self.harmonie.get_erlaubte_notenlaenge(self.harmonie.get_taktposition(einsatz))
+
+    def _spanne(self, einsatz, ziel, ton):
+        """Prüft die Zusammenklänge, während `ton` von `einsatz` bis `ziel` liegt.
+
+        Liefert None, wenn eine Regel verletzt ist, sonst
+        (Auflösung nötig?, letztes Intervall mit Vorzeichen, Notennummer des letzten Choraltons).
+        """
+        noten = self.choral.notenliste
+        nummer = self._notennummer(einsatz)
+        konsonant = True  # der Zusammenklang am Einsatz ist durch die Domäne konsonant
+        naechste = nummer + 1
+        while naechste < len(noten) and self.einsaetze[naechste] < ziel:
+            choralton = noten[naechste][0]
+            if self.regeln.mi_contra_fa(choralton, ton):
+                return None
+            jetzt_konsonant = self.harmonie.interval_quality(
+                self.harmonie.get_interval(choralton, ton)
+            ) == "Konsonanz"
+            if not jetzt_konsonant and not konsonant:
+                return None  # Dissonanz nur nach einem konsonanten Zusammenklang
+            konsonant = jetzt_konsonant
+            nummer = naechste
+            naechste += 1
+        return (not konsonant, ton - noten[nummer][0], nummer)
+
+    def _folgetoene(self, einsatz, ton, dauer, kandidaten):
+        """Alle Töne aus `kandidaten`, die regelkonform auf (`einsatz`, `ton`, `dauer`) folgen."""
+        spanne = self._spanne(einsatz, einsatz + dauer, ton)
+        if spanne is None:
+            return frozenset()
+        braucht_aufloesung, letztes_intervall, letzte_nummer = spanne
+        folgetoene = kandidaten & self._melodisch.get(ton, frozenset())
+        if braucht_aufloesung:
+            folgetoene = folgetoene & {ton - 1, ton - 2}
+        ziel_nummer = self._notennummer(einsatz + dauer)
+        if folgetoene and ziel_nummer != letzte_nummer and abs(letztes_intervall) % 12 in (0, 7):
+            # Parallele Primen/Quinten/Oktaven: beide Stimmen bewegen sich, Intervall bleibt gleich
+            ziel_choralton = self.choral.notenliste[ziel_nummer][0]
+            parallel = ziel_choralton + letztes_intervall
+            if parallel != ton:
+                folgetoene = folgetoene - {parallel}
+        return folgetoene
+
+    # --- Rückwärtsprüfung ---
+    def _rueckwaerts_pruefen(self):
+        vorletzter, letzter = self.vorletzter_einsatz, self.letzter_einsatz
+        machbar = {}
+        schluss = frozenset({self.schlusston})
+        machbar[vorletzter] = frozenset(
+            c for c in self._toene
+            if c == self.klauselton
+            and self._folgetoene(vorletzter, c, letzter - vorletzter, schluss)
+        )
+        for einsatz in range(vorletzter - 1, -1, -1):
+            if einsatz == 0:
+                kandidaten = {self.anfangston}
+            else:
+                kandidaten = self._domaenen[self._notennummer(einsatz)]
+            erreichbar = set()
+            for ton in kandidaten:
+                for dauer in self._dauern(einsatz):
+                    ziel = machbar.get(einsatz + dauer)
+                    if einsatz + dauer <= vorletzter and ziel and self._folgetoene(einsatz, ton, dauer, ziel):
+                        erreichbar.add(ton)
+                        break
+            machbar[einsatz] = frozenset(erreichbar)
+        return machbar
+
+    # --- Abfragen ---
+    def start_toene(self):
+        """Töne, mit denen ein regelkonformer Kontrapunkt beginnen kann."""
+        return tuple(sorted(self._machbar.get(0, frozenset())))
+
+    def machbar(self, einsatz, ton):
+        return ton in self._machbar.get(einsatz, frozenset())
+
+    def uebergaenge(self, einsatz, ton):
+        """Liste von (Dauer, Folgetöne) ab (`einsatz`, `ton`), die nicht in eine Sackgasse führen.
+
+        Am vorletzten Einsatz ist nur noch der Übergang in den Schlusston möglich.
+        """
+        if einsatz == self.vorletzter_einsatz:
+            return [(self.letzter_einsatz - einsatz, (self.schlusston,))]
+        optionen = []
+        for dauer in self._dauern(einsatz):
+            ziel = self._machbar.get(einsatz + dauer)
+            if einsatz + dauer > self.vorletzter_einsatz or not ziel:
+                continue
+            folgetoene = self._folgetoene(einsatz, ton, dauer, ziel)
+            if folgetoene:
+                optionen.append((dauer, tuple(sorted(folgetoene))))
+        return optionen
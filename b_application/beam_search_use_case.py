@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Anwendungsfall: die besten Kontrapunkte per Beam-Suche erzeugen (Application-Schicht).
+
+Statt viele unabhängige Zufallsläufe zu erzeugen und hinterher auszusortieren,
+verfolgt die Beam-Suche in einem Durchgang mehrere Teil-Kontrapunkte zugleich.
+Grundlage sind die Übergänge der Vorwärtsprüfung (a_domain.Vorwaertspruefung):
+Jeder Teil-Kontrapunkt bleibt damit regelkonform und vervollständigbar.
+
+Die Suche läuft Zählzeit für Zählzeit; an jedem Einsatz werden nur die `breite`
+besten Teil-Kontrapunkte weiterverfolgt. Bewertet wird jeder Übergang mit einer
+austauschbaren Funktion (Standard: `default_score`), verglichen wird der
+Mittelwert je Übergang, damit Lösungen mit vielen kurzen Noten nicht allein
+durch die Anzahl ihrer Übergänge gewinnen. Teil-Kontrapunkte teilen sich ihren
+gemeinsamen Anfang über Elternverweise; eine Verzweigung kostet nur einen Knoten.
+"""
+
+import heapq
+import random
+import time
+from dataclasses import dataclass
+from itertools import count
+from random import Random
+from typing import Callable, Iterable, Iterator
+
+from a_domain.Melodie import Melodie
+from a_domain.Tonleitern import f_dur
+from a_domain.Vorwaertspruefung import Vorwaertspruefung
+from .forward_checking_use_case import GenerateCounterpointForwardCheckingUseCase
+from .generate_batch_use_case import CounterpointRun, derive_seeds
+from .search_budget import STATUS_OK, GenerationResult, SearchBudget
+from .search_stats import SearchStats
+
+
+@dataclass(frozen=True)
+class Transition:
+    """Ein Schritt im Kontrapunkt: `ton` setzt bei `einsatz` ein, liegt `dauer` Achtel, dann folgt `folgeton`.
+
+    `choralton` klingt beim Einsatz, `folge_choralton` beim Einsatz des Folgetons.
+    """
+
+    einsatz: int
+    ton: int
+    dauer: int
+    folgeton: int
+    choralton: int
+    folge_choralton: int
+
+
+def default_score(t: Transition) -> float:
+    """Standardbewertung (höher ist besser): imperfekte Konsonanzen, Schritte, Gegenbewegung."""
+    wert = 0.0
+    # Terzen und Sexten am Einsatz
+    if abs(t.ton - t.choralton) % 12 in (3, 4, 8, 9):
+        wert += 1.0
+    # Schrittweise Bewegung bevorzugen, Tonwiederholung meiden
+    schritt = abs(t.folgeton - t.ton)
+    if schritt in (1, 2):
+        wert += 1.0
+    elif schritt in (3, 4):
+        wert += 0.5
+    elif schritt == 0:
+        wert -= 1.0
+    # Gegenbewegung bevorzugen, Seitenbewegung zur Hälfte
+    kontra, choral = t.folgeton - t.ton, t.folge_choralton - t.choralton
+    if kontra * choral < 0:
+        wert += 1.0
+    elif (kontra == 0) != (choral == 0):
+        wert += 0.5
+    return wert
+
+
+@dataclass(frozen=True)
+class ScoredCounterpoint:
+    """Vollständiger Kontrapunkt mit mittlerer Bewertung je Übergang."""
+
+    kontrapunkt: Melodie
+    wertung: float
+
+
+class _Knoten:
+    """Teil-Kontrapunkt bis zum Einsatz von `ton`; der Anfang hängt am Elternknoten."""
+
+    __slots__ = ("ton", "dauer", "eltern", "summe", "anzahl")
+
+    def __init__(self, ton, dauer, eltern, summe, anzahl):
+        self.ton = ton
+        self.dauer = dauer  # Dauer der Elternnote (Kante Eltern -> dieser Knoten)
+        self.eltern = eltern
+        self.summe = summe
+        self.anzahl = anzahl
+
+    def mittel(self) -> float:
+        return self.summe / self.anzahl if self.anzahl else 0.0
+
+    def noten(self, schlussdauer: int) -> list[tuple[int, int]]:
+        noten = [(self.ton, schlussdauer)]
+        knoten = self
+        while knoten.eltern is not None:
+            noten.append((knoten.eltern.ton, knoten.dauer))
+            knoten = knoten.eltern
+        noten.reverse()
+        return noten
+
+
+def _aufnehmen(schicht: list, breite: int, mittel: float, rng, nummer, *knoten) -> None:
+    """Nimmt einen Teil-Kontrapunkt in den Heap auf, wenn er zu den `breite` besten gehört.
+
+    Der Knoten wird erst angelegt, wenn er aufgenommen wird; das Los für
+    Gleichstände wird nur bei Bedarf gezogen.
+    """
+    if len(schicht) >= breite and mittel < schicht[0][0]:
+        return
+    eintrag = (mittel, rng.random(), next(nummer), _Knoten(*knoten))
+    if len(schicht) < breite:
+        heapq.heappush(schicht, eintrag)
+    elif eintrag > schicht[0]:
+        heapq.heapreplace(schicht, eintrag)
+
+
+class GenerateCounterpointBeamSearchUseCase:
+    """Erzeugt zu einem Choral die k besten Kontrapunkte in einem Suchdurchgang.
+
+    Eingabe: Melodie (Choral), optional k und eine Zufallsquelle
+    Ausgabe: Liste von ScoredCounterpoint, beste zuerst (`execute`: nur der beste)
+    Abhängigkeiten: ausschließlich a_domain
+
+    `breite` ist die Zahl der Teil-Kontrapunkte je Einsatz (mindestens k);
+    `score` bewertet einen Transition. Die Zufallsquelle entscheidet nur
+    zwischen gleich bewerteten Teil-Kontrapunkten.
+    """
+
+    def __init__(self, breite: int = 8, score: Callable[[Transition], float] = default_score) -> None:
+        if breite < 1:
+            raise ValueError(f"breite muss >= 1 sein, nicht {breite}")
+        self.breite = breite
+        self.score = score
+
+    def pruefung(self, choral: Melodie) -> Vorwaertspruefung:
+        return GenerateCounterpointForwardCheckingUseCase().pruefung(choral)
+
+    def execute(self, choral: Melodie, rng: Random | None = None) -> Melodie:
+        return self.execute_with_stats(choral, rng=rng)[0]
+
+    def execute_with_stats(self, choral: Melodie, rng: Random | None = None) -> tuple[Melodie, SearchStats]:
+        beste, stats = self.execute_top_k_with_stats(choral, k=1, rng=rng)
+        return beste[0].kontrapunkt, stats
+
+    def execute_budgeted(self, choral: Melodie, rng: Random | None = None,
+                         budget: SearchBudget | None = None) -> GenerationResult:
+        """Wie execute_with_stats, Status immer "ok"; `budget` wird ignoriert.
+
+        Der Aufwand ist durch Breite und Länge des Chorals begrenzt. Der Parameter
+        existiert nur für die gemeinsame Schnittstelle mit GenerateCounterpointUseCase.
+        """
+        kontrapunkt, stats = self.execute_with_stats(choral, rng=rng)
+        return GenerationResult(kontrapunkt, STATUS_OK, stats)
+
+    def execute_top_k(self, choral: Melodie, k: int | None = None,
+                      rng: Random | None = None) -> list[ScoredCounterpoint]:
+        return self.execute_top_k_with_stats(choral, k=k, rng=rng)[0]
+
+    def execute_top_k_with_stats(self, choral: Melodie, k: int | None = None,
+                                 rng: Random | None = None) -> tuple[list[ScoredCounterpoint], SearchStats]:
+        k = self.breite if k is None else k
+        if k < 1:
+            raise ValueError(f"k muss >= 1 sein, nicht {k}")
+        breite = max(self.breite, k)
+        rng = rng or random
+        stats = SearchStats()
+        t_start = time.perf_counter()
+        pruefung = self.pruefung(choral)
+        t_search = time.perf_counter()
+        stats.add_phase("pruning", t_search - t_start)
+
+        start_toene = pruefung.start_toene()
+        if not start_toene:
+            raise ValueError("Zu diesem Choral existiert kein regelkonformer Kontrapunkt.")
+        noten = choral.notenliste
+        einsaetze = noten.einsaetze()
+        ende = pruefung.letzter_einsatz
+        nummer = count()
+
+        # Je Einsatz ein Min-Heap der besten Teil-Kontrapunkte (Rang, Los, Nr, Knoten), höchstens `breite`
+        schichten: dict[int, list] = {0: []}
+        for ton in start_toene:
+            _aufnehmen(schichten[0], breite, 0.0, rng, nummer, ton, 0, None, 0.0, 0)
+        for einsatz in range(ende):
+            schicht = schichten.pop(einsatz, None)
+            if not schicht:
+                continue
+            choralton = noten[choral.get_aktuelleNotenNummer(einsatz)][0]
+            # Übergänge und Bewertungen hängen nur vom Ton ab, nicht vom Weg dorthin
+            bewertet: dict[int, list[tuple[int, list[tuple[int, float]]]]] = {}
+            erzeugt = 0
+            for _, _, _, eltern in schicht:
+                optionen = bewertet.get(eltern.ton)
+                if optionen is None:
+                    optionen = bewertet[eltern.ton] = [
+                        (dauer, [
+                            (folgeton, self.score(Transition(
+                                einsatz, eltern.ton, dauer, folgeton, choralton,
+                                noten[choral.get_aktuelleNotenNummer(einsatz + dauer)][0],
+                            )))
+                            for folgeton in folgetoene
+                        ])
+                        for dauer, folgetoene in pruefung.uebergaenge(einsatz, eltern.ton)
+                    ]
+                anzahl = eltern.anzahl + 1
+                for dauer, folgen in optionen:
+                    ziel = schichten.setdefault(einsatz + dauer, [])
+                    for folgeton, wert in folgen:
+                        summe = eltern.summe + wert
+                        # Schneller Ausschluss ohne Funktionsaufruf (häufigster Fall bei voller Schicht)
+                        if len(ziel) >= breite and summe / anzahl < ziel[0][0]:
+                            continue
+                        _aufnehmen(ziel, breite, summe / anzahl, rng, nummer, folgeton, dauer, eltern, summe, anzahl)
+                    erzeugt += len(folgen)
+            stats.candidates_per_tick[einsatz] += erzeugt
+
+        fertig = sorted(schichten.get(ende, ()), reverse=True)[:k]
+        schlussdauer = einsaetze[-1] - ende
+        beste = [ScoredCounterpoint(Melodie(kn.noten(schlussdauer), f_dur), kn.mittel()) for _, _, _, kn in fertig]
+        stats.add_phase("search", time.perf_counter() - t_search)
+        return beste, stats
+
+    def iter_corpus(self, chorale: Iterable[tuple[object, Melodie]], k: int,
+                    seed: int | None = None) -> Iterator[tuple[object, list[CounterpointRun]]]:
+        """Liefert je Choral (Schlüssel, die k besten als CounterpointRun) aus je einem Durchgang.
+
+        Die Seeds je Choral werden wie bei GenerateCounterpointBatchUseCase in
+        Eingabereihenfolge aus `seed` abgeleitet. Anders als dort sind die Läufe
+        eines Chorals keine unabhängigen Läufe, sondern die Ränge eines Durchgangs:
+        `index` ist der Rang (0 = beste), alle tragen denselben Seed (er reproduziert
+        den ganzen Durchgang) und dieselbe SearchStats des Durchgangs. Für eine
+        Gesamtstatistik zählt daher nur die Statistik von Rang 0 je Choral.
+
+        Scheitert der Durchgang (z. B. ohne regelkonformen Kontrapunkt), wird für
+        den Choral ein einzelner Lauf mit Status "error" geliefert.
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        quelle = random.Random(seed)
+        for key, choral in chorale:
+            s = derive_seeds(quelle.getrandbits(64), 1)[0]
+            try:
+                beste, stats = self.execute_top_k_with_stats(choral, k=k, rng=random.Random(s))
+            except Exception as e:
+                yield key, [CounterpointRun.gescheitert(0, s, e)]
+                continue
+            yield key, [
+                CounterpointRun(index=i, seed=s, kontrapunkt=b.kontrapunkt, stats=stats)
+                for i, b in enumerate(beste)
+            ]
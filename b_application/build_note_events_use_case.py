@@ -3,15 +3,28 @@
 
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
+from operator import itemgetter
+from typing import TYPE_CHECKING, Iterable, Iterator
+
 from a_domain.Melodie import Melodie
 
+if TYPE_CHECKING:
+    from .note_event_buffer import NoteEventBuffer
+
 
 @dataclass(frozen=True)
 class NoteEvent:
     time_tick: int
     on: bool
     pitch: int
+    voice: int = 0  # Index der Stimme in der Eingabereihenfolge (0 = Choral)
+
+
+# Rohe Events sind Tupel (time_tick, on, pitch, voice); sortiert wird nach Zeit,
+# dann Off (False) vor On (True).
+_sortierschluessel = itemgetter(0, 1)
 
 
 class BuildNoteEventsUseCase:
@@ -20,25 +33,45 @@ class BuildNoteEventsUseCase:
     - Ticks: Einheit entspricht der bestehenden Zählzeit (Achtel = 1).
     - Events werden nach Zeit sortiert, bei gleicher Zeit kommen Note-Off vor Note-On,
       um Hänger zu vermeiden.
+    - `iter_events` liefert dieselbe Folge lazy für beliebig viele Stimmen: Die Events
+      jeder Stimme sind bereits zeitlich geordnet und werden per k-Wege-Merge
+      zusammengeführt, ohne alle Events vorzuhalten oder zu sortieren.
+    - `execute_buffer` legt die Folge kompakt in einem NoteEventBuffer ab.
+    - Statt einer Melodie darf jede Stimme auch ein Iterator über (Pitch, Dauer)
+      sein, z. B. die noch laufende Erzeugung eines Kontrapunkts; Events entstehen
+      dann erst, wenn die jeweilige Note geliefert wird.
     """
 
     def execute(self, choral: Melodie, kontra: Melodie) -> list[NoteEvent]:
-        events: list[NoteEvent] = []
+        return list(self.iter_events(choral, kontra))
 
-        # Stimme 1
-        t = 0
-        for pitch, duration in choral.notenliste:
-            events.append(NoteEvent(t, True, pitch))
-            events.append(NoteEvent(t + duration, False, pitch))
-            t += duration
+    def iter_events(self, *stimmen: Melodie | Iterable[tuple[int, int]]) -> Iterator[NoteEvent]:
+        for roh in self._merge(stimmen):
+            yield NoteEvent(*roh)
+
+    def execute_buffer(self, *stimmen: Melodie | Iterable[tuple[int, int]]) -> NoteEventBuffer:
+        from .note_event_buffer import NoteEventBuffer
+
+        buffer = NoteEventBuffer()
+        for time_tick, on, pitch, voice in self._merge(stimmen):
+            buffer.append(time_tick, on, pitch, voice)
+        return buffer
 
-        # Stimme 2
+    def _merge(self, stimmen: tuple[Melodie | Iterable[tuple[int, int]], ...]) -> Iterator[tuple[int, bool, int, int]]:
+        # heapq.merge ist stabil: bei gleichem Schlüssel kommt die frühere Stimme zuerst,
+        # genau wie beim früheren Sortieren der aneinandergehängten Event-Listen.
+        return heapq.merge(
+            *(
+                self._events_einer_stimme(stimme.notenliste if isinstance(stimme, Melodie) else stimme, voice)
+                for voice, stimme in enumerate(stimmen)
+            ),
+            key=_sortierschluessel,
+        )
+
+    @staticmethod
+    def _events_einer_stimme(noten: Iterable[tuple[int, int]], voice: int) -> Iterator[tuple[int, bool, int, int]]:
         t = 0
-        for pitch, duration in kontra.notenliste:
-            events.append(NoteEvent(t, True, pitch))
-            events.append(NoteEvent(t + duration, False, pitch))
+        for pitch, duration in noten:
+            yield t, True, pitch, voice
+            yield t + duration, False, pitch, voice
             t += duration
-
-        # Sortierung: Zeit, dann Off vor On
-        events.sort(key=lambda e: (e.time_tick, 0 if not e.on else 1))
-        return events
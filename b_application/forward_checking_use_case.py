@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Anwendungsfall: Kontrapunkt mit Vorwärtsprüfung erzeugen (Application-Schicht).
+
+Alternative zu GenerateCounterpointUseCase: Statt blindem Backtracking werden die
+Tondomänen aller Choral-Segmente vorab beschnitten (a_domain.Vorwaertspruefung).
+Die anschließende Zufallswahl kann dadurch nie in eine Sackgasse laufen; die
+Laufzeit ist linear in der Länge des Chorals und unabhängig vom Zufall.
+
+Weil nach der Prüfung keine Note mehr zurückgenommen wird, ist jede gewählte
+Note sofort endgültig: `iter_notes` liefert sie einzeln, während die Suche
+noch läuft (z. B. für Wiedergabe oder Export im Pipeline-Betrieb).
+"""
+
+import random
+import time
+from random import Random
+from typing import Iterator
+
+from a_domain.Melodie import Melodie
+from a_domain.HarmonischeStruktur import HarmonischeStruktur
+from a_domain.KpRegeln import KpRegeln
+from a_domain.Tonleitern import f_dur
+from a_domain.Vorwaertspruefung import Vorwaertspruefung
+from .search_budget import STATUS_OK, GenerationResult, SearchBudget
+from .search_stats import SearchStats
+
+
+class GenerateCounterpointForwardCheckingUseCase:
+    """Erzeugt zu einem gegebenen Choral einen zweistimmigen Kontrapunkt per Vorwärtsprüfung.
+
+    Eingabe: Melodie (Choral), optional eine Zufallsquelle
+    Ausgabe: Melodie (Kontrapunkt)
+    Abhängigkeiten: ausschließlich a_domain
+
+    Existiert zu einem Choral kein regelkonformer Kontrapunkt, wird das vor der
+    Suche erkannt und ein ValueError ausgelöst, ebenso für Choräle ohne Tenor-
+    oder Sopranklausel (wie bei GenerateCounterpointUseCase).
+    """
+
+    def pruefung(self, choral: Melodie) -> Vorwaertspruefung:
+        kontrapunkt = Melodie([], f_dur)
+        harmonie = HarmonischeStruktur(choral, kontrapunkt)
+        regeln = KpRegeln(harmonie, choral, kontrapunkt)
+        return Vorwaertspruefung(choral, harmonie, regeln)
+
+    def execute(self, choral: Melodie, rng: Random | None = None) -> Melodie:
+        return self.execute_with_stats(choral, rng=rng)[0]
+
+    def execute_with_stats(self, choral: Melodie, rng: Random | None = None) -> tuple[Melodie, SearchStats]:
+        # Ohne Backtracking bleiben die Zähler bei 0; relevant sind die Phasenzeiten.
+        stats = SearchStats()
+        t_start = time.perf_counter()
+        pruefung = self.pruefung(choral)
+        t_search = time.perf_counter()
+        stats.add_phase("pruning", t_search - t_start)
+
+        kontrapunkt = Melodie(list(self._noten(pruefung, choral, rng or random)), f_dur)
+        stats.add_phase("search", time.perf_counter() - t_search)
+        return kontrapunkt, stats
+
+    def execute_budgeted(self, choral: Melodie, rng: Random | None = None,
+                         budget: SearchBudget | None = None) -> GenerationResult:
+        """Wie execute_with_stats, Status immer "ok"; `budget` wird ignoriert.
+
+        Die Laufzeit ist linear und ohne Rücksprünge, ein Budget wird nicht gebraucht.
+        Der Parameter existiert nur für die gemeinsame Schnittstelle mit
+        GenerateCounterpointUseCase.
+        """
+        kontrapunkt, stats = self.execute_with_stats(choral, rng=rng)
+        return GenerationResult(kontrapunkt, STATUS_OK, stats)
+
+    def iter_notes(self, choral: Melodie, rng: Random | None = None) -> Iterator[tuple[int, int]]:
+        """Liefert die Noten des Kontrapunkts (Pitch, Dauer) einzeln, sobald sie feststehen.
+
+        Die Vorwärtsprüfung läuft beim ersten next(); danach kostet jede Note nur
+        noch eine Auswahl. Bei gleicher Zufallsquelle entsteht dieselbe Folge wie
+        bei execute.
+        """
+        yield from self._noten(self.pruefung(choral), choral, rng or random)
+
+    @staticmethod
+    def _noten(pruefung: Vorwaertspruefung, choral: Melodie, rng) -> Iterator[tuple[int, int]]:
+        start_toene = pruefung.start_toene()
+        if not start_toene:
+            raise ValueError("Zu diesem Choral existiert kein regelkonformer Kontrapunkt.")
+
+        einsatz = 0
+        ton = start_toene[rng.randint(0, len(start_toene) - 1)]
+        while einsatz < pruefung.letzter_einsatz:
+            optionen = pruefung.uebergaenge(einsatz, ton)
+            dauer, folgetoene = optionen[rng.randint(0, len(optionen) - 1)]
+            # Jede Note ist endgültig: die Folgetöne führen nie in eine Sackgasse
+            yield ton, dauer
+            einsatz += dauer
+            ton = folgetoene[rng.randint(0, len(folgetoene) - 1)]
+        yield ton, choral.notenliste[-1][1]
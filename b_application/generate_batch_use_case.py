@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Anwendungsfall: viele Kontrapunkte zu einem Choral erzeugen (Application-Schicht).
+
+Die einzelnen Läufe werden auf einen Prozess-Pool verteilt. Jeder Lauf erhält
+einen eigenen, aus dem Basis-Seed abgeleiteten Zufallsgenerator; dadurch ist das
+Ergebnis unabhängig davon reproduzierbar, welcher Worker welchen Lauf wann ausführt.
+
+`iter_corpus` verarbeitet beliebig viele Choräle als Strom und liefert jeden
+Lauf, sobald er fertig ist. Scheitert ein einzelner Lauf (z. B. an einem Choral
+ohne Klausel), wird er mit Status "error" geliefert und der Strom läuft weiter.
+"""
+
+import contextlib
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator
+
+from a_domain.Melodie import Melodie
+from a_domain.Tonleitern import f_dur
+from .generate_counterpoint_use_case import GenerateCounterpointUseCase
+from .search_budget import STATUS_OK
+from .search_stats import SearchStats
+
+STATUS_ERROR = "error"  # Lauf gescheitert, Meldung in CounterpointRun.fehler
+
+
+@dataclass(frozen=True)
+class CounterpointRun:
+    """Ergebnis eines einzelnen Laufs innerhalb einer Batch-Erzeugung."""
+
+    index: int
+    seed: int
+    kontrapunkt: Melodie
+    stats: SearchStats
+    status: str = STATUS_OK  # "ok", "relaxed" oder "partial" (siehe SearchBudget), "error" in iter_corpus
+    fehler: str | None = None  # Fehlermeldung bei Status "error"
+
+    @classmethod
+    def gescheitert(cls, index: int, seed: int, fehler: BaseException) -> CounterpointRun:
+        """Lauf mit Status "error" (leerer Kontrapunkt, leere Statistik)."""
+        return cls(index=index, seed=seed, kontrapunkt=Melodie([], f_dur), stats=SearchStats(),
+                   status=STATUS_ERROR, fehler=f"{type(fehler).__name__}: {fehler}")
+
+
+def derive_seeds(seed: int | None, anzahl: int) -> list[int]:
+    """Leitet aus einem Basis-Seed `anzahl` unabhängige 64-Bit-Seeds ab.
+
+    Ohne Basis-Seed wird einer aus der Systementropie gezogen; die abgeleiteten
+    Seeds stehen in jedem CounterpointRun und erlauben das Nachspielen einzelner Läufe.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    quelle = random.Random(seed)
+    return [quelle.getrandbits(64) for _ in range(anzahl)]
+
+
+def _run_once(generate_uc: GenerateCounterpointUseCase, choral: Melodie, index: int, seed: int) -> CounterpointRun:
+    # Jeder Lauf bekommt eine frische Choral-Kopie, da die Suche Zustand am Choral ablegt.
+    choral = Melodie(list(choral.notenliste), choral.tonart)
+    ergebnis = generate_uc.execute_budgeted(choral, rng=random.Random(seed))
+    return CounterpointRun(index=index, seed=seed, kontrapunkt=ergebnis.kontrapunkt,
+                           stats=ergebnis.stats, status=ergebnis.status)
+
+
+def _run_once_stderr(generate_uc: GenerateCounterpointUseCase, choral: Melodie, index: int, seed: int) -> CounterpointRun:
+    # Diagnoseausgaben der Suche auf stderr, damit stdout für Ergebnisse frei bleibt.
+    # Ein gescheiterter Lauf wird als Ergebnis geliefert, statt den ganzen Strom abzubrechen.
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            return _run_once(generate_uc, choral, index, seed)
+    except Exception as e:
+        return CounterpointRun.gescheitert(index, seed, e)
+
+
+class GenerateCounterpointBatchUseCase:
+    """Erzeugt `anzahl` Kontrapunkte zu einem Choral, optional parallel.
+
+    Eingabe: Melodie (Choral), Anzahl, Worker-Anzahl, optionaler Basis-Seed
+    Ausgabe: Liste von CounterpointRun, sortiert nach Laufindex
+    (Gesamtstatistik: `SearchStats.aggregate(run.stats for run in runs)`)
+    """
+
+    def __init__(self, generate_uc: GenerateCounterpointUseCase) -> None:
+        self.generate_uc = generate_uc
+
+    def execute(self, choral: Melodie, anzahl: int, workers: int = 1,
+                seed: int | None = None) -> list[CounterpointRun]:
+        if anzahl < 0:
+            raise ValueError(f"anzahl muss >= 0 sein, nicht {anzahl}")
+        seeds = derive_seeds(seed, anzahl)
+        indices = range(anzahl)
+
+        if workers <= 1 or anzahl <= 1:
+            return [_run_once(self.generate_uc, choral, i, s) for i, s in zip(indices, seeds)]
+
+        # Executor.map liefert in Eingabereihenfolge, unabhängig von der Fertigstellungsreihenfolge.
+        chunksize = max(1, anzahl // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                _run_once,
+                [self.generate_uc] * anzahl,
+                [choral] * anzahl,
+                indices,
+                seeds,
+                chunksize=chunksize,
+            ))
+
+    def iter_corpus(self, chorale: Iterable[tuple[object, Melodie]], anzahl: int, workers: int = 1,
+                    seed: int | None = None) -> Iterator[tuple[object, CounterpointRun]]:
+        """Erzeugt je Choral `anzahl` Kontrapunkte und liefert (Schlüssel, Lauf) in Fertigstellungsreihenfolge.
+
+        Die Choräle werden lazy gelesen; gleichzeitig unterwegs sind höchstens
+        `workers * 4` Läufe. Die Seeds je Choral werden in Eingabereihenfolge aus
+        `seed` abgeleitet und sind damit unabhängig von der Parallelität reproduzierbar.
+        Ausnahmen einzelner Läufe werden als CounterpointRun mit Status "error" geliefert.
+        """
+        if anzahl < 0:
+            raise ValueError(f"anzahl muss >= 0 sein, nicht {anzahl}")
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        quelle = random.Random(seed)
+
+        def auftraege() -> Iterator[tuple[object, Melodie, int, int]]:
+            for key, choral in chorale:
+                for i, s in enumerate(derive_seeds(quelle.getrandbits(64), anzahl)):
+                    yield key, choral, i, s
+
+        if workers <= 1:
+            for key, choral, i, s in auftraege():
+                yield key, _run_once_stderr(self.generate_uc, choral, i, s)
+            return
+
+        offen = {}
+        strom = auftraege()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            def nachfuellen() -> None:
+                for key, choral, i, s in islice(strom, workers * 4 - len(offen)):
+                    offen[pool.submit(_run_once_stderr, self.generate_uc, choral, i, s)] = key, i, s
+
+            nachfuellen()
+            while offen:
+                fertig, _ = wait(offen, return_when=FIRST_COMPLETED)
+                for future in fertig:
+                    key, i, s = offen.pop(future)
+                    try:
+                        run = future.result()
+                    except Exception as e:
+                        # z. B. nicht übertragbares Ergebnis oder abgestürzter Worker
+                        run = CounterpointRun.gescheitert(i, s, e)
+                    yield key, run
+                nachfuellen()
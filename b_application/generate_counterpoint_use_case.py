@@ -7,30 +7,81 @@ from __future__ import annotations
 
 Diese Use-Case-Implementierung kapselt die bisher im Controller liegende
 Algorithmik und hängt ausschließlich von der Domänelogik (a_domain) ab.
+
+Die Backtracking-Suche ist nicht beschränkt und kann bei ungünstigen Chorälen
+sehr lange laufen; ein SearchBudget bricht sie nach Zeit, Rücksprüngen oder
+get_contra-Aufrufen ab (`execute_budgeted` liefert dann einen Status).
+
+Nach einem Fehlschlag springt die Suche per Conflict-directed Backjumping
+zurück: get_contra meldet, von welchen Kontrapunktnoten der Fehlschlag abhing
+(KpRegeln.letzter_konflikt); zurückgenommen wird bis zur jüngsten davon, und
+deren gescheiterter Wert bleibt für dasselbe Präfix ausgeschlossen.
 """
 
+import time
+from random import Random
+
 from a_domain.Melodie import Melodie
 from a_domain.HarmonischeStruktur import HarmonischeStruktur
 from a_domain.KpRegeln import KpRegeln
 from a_domain.Tonleitern import f_dur
 from a_domain.types import ContraDecision
+from .search_budget import STATUS_OK, STATUS_PARTIAL, STATUS_RELAXED, GenerationResult, SearchBudget
+from .search_stats import SearchStats
 
 
 class GenerateCounterpointUseCase:
     """Erzeugt zu einem gegebenen Choral einen zweistimmigen Kontrapunkt.
 
-    Eingabe: Melodie (Choral)
+    Eingabe: Melodie (Choral), optional eine Zufallsquelle
     Ausgabe: Melodie (Kontrapunkt)
     Abhängigkeiten: ausschließlich a_domain
+
+    Wird `rng` übergeben (z. B. `Random(seed)`), ziehen alle Zufallsentscheidungen
+    der Domäne daraus; derselbe Seed liefert dann denselben Kontrapunkt.
+    `execute_with_stats` liefert zusätzlich eine SearchStats zum Lauf.
+
+    `budget` (im Konstruktor als Standard oder je Aufruf) begrenzt die Suche;
+    `execute_budgeted` liefert ein GenerationResult mit Status.
+    Mit `backjumping=False` wird wie früher je Fehlschlag genau eine Note
+    zurückgenommen.
+
+    Ist der Suchraum erschöpft (jede Anfangsnote gescheitert), gibt es keinen
+    regelkonformen Kontrapunkt: ohne Budget folgt ein ValueError, mit Budget
+    gilt wie bei jeder anderen Grenze `budget.relax`.
     """
 
-    def execute(self, choral: Melodie) -> Melodie:
+    def __init__(self, budget: SearchBudget | None = None, backjumping: bool = True) -> None:
+        self.budget = budget
+        self.backjumping = backjumping
+
+    def execute(self, choral: Melodie, rng: Random | None = None,
+                budget: SearchBudget | None = None) -> Melodie:
+        return self.execute_budgeted(choral, rng=rng, budget=budget).kontrapunkt
+
+    def execute_with_stats(self, choral: Melodie, rng: Random | None = None,
+                           budget: SearchBudget | None = None) -> tuple[Melodie, SearchStats]:
+        ergebnis = self.execute_budgeted(choral, rng=rng, budget=budget)
+        return ergebnis.kontrapunkt, ergebnis.stats
+
+    def execute_budgeted(self, choral: Melodie, rng: Random | None = None,
+                         budget: SearchBudget | None = None) -> GenerationResult:
+        budget = budget or self.budget
+        grenze = None
+        stats = SearchStats()
+        t_start = time.perf_counter()
         kontrapunkt = Melodie([], f_dur)
-        harmonie = HarmonischeStruktur(choral, kontrapunkt)
-        regeln = KpRegeln(harmonie, choral, kontrapunkt)
+        harmonie = HarmonischeStruktur(choral, kontrapunkt, rng=rng)
+        regeln = KpRegeln(harmonie, choral, kontrapunkt, rng=rng)
+        # Choräle ohne Klausel vorab ablehnen statt erst an der vorletzten Note
+        regeln.klauselton(choral.notenliste)
 
         position_im_stueck = 0
         anzahl_zaehlzeiten_1, anzahl_zaehlzeiten_2 = 0, 0
+        # Backjumping: je Notenindex die gescheiterten (Pitch, Dauer)-Werte und die
+        # früheren Notenindizes, die an diesen Fehlschlägen beteiligt waren
+        ausschluss: dict[int, set[tuple[int, int]]] = {}
+        konflikte: dict[int, set[int]] = {}
 
         laenge_des_stuecks = choral.laenge()
 
@@ -53,6 +104,8 @@ class GenerateCounterpointUseCase:
                 # Fallback: defensiv scheitern ohne Positionsänderung
                 return ContraDecision(False, retry_position=position_im_stueck)
 
+        t_search = time.perf_counter()
+        stats.add_phase("setup", t_search - t_start)
         while position_im_stueck < laenge_des_stuecks:
             ton_2 = [True]
             if position_im_stueck == anzahl_zaehlzeiten_1:
@@ -64,24 +117,64 @@ class GenerateCounterpointUseCase:
             if position_im_stueck == anzahl_zaehlzeiten_2:
                 if position_im_stueck == 0:
                     midipitch_2 = midipitch_1 + 12  # type: ignore[name-defined]
-                    notenlaenge = harmonie.notenlaenge_waehlen(
-                        harmonie.get_erlaubte_notenlaenge(harmonie.get_taktposition(position_im_stueck))
-                    )
+                    erlaubt = harmonie.get_erlaubte_notenlaenge(harmonie.get_taktposition(position_im_stueck))
+                    if ausschluss.get(0):
+                        erlaubt = [d for d in erlaubt if (midipitch_2, d) not in ausschluss[0]]
+                        if not erlaubt:
+                            # Jede Anfangsnote ist gescheitert: regelkonform gibt es keine Lösung
+                            grenze = "suchraum"
+                            break
+                    notenlaenge = harmonie.notenlaenge_waehlen(erlaubt)
                     kontrapunkt.notenliste.append((midipitch_2, notenlaenge))
                     anzahl_zaehlzeiten_2 = notenlaenge
                 else:
-                    raw = regeln.get_contra(position_im_stueck)
+                    noten_vorher = len(kontrapunkt.notenliste)
+                    letzte = kontrapunkt.notenliste[-1]
+                    if self.backjumping:
+                        raw = regeln.get_contra(position_im_stueck, ausschluss.get(noten_vorher, ()))
+                    else:
+                        raw = regeln.get_contra(position_im_stueck)
                     decision = _wrap_contra(raw)
+                    stats.get_contra_calls += 1
+                    stats.candidates_per_tick[position_im_stueck] += len(regeln.letzte_kandidaten)
                     if decision.ok and decision.pitch is not None and decision.duration is not None:
                         midipitch_2 = decision.pitch
                         notenlaenge = decision.duration
                         # Achtung: notenliste enthält weiterhin Tupel, um Kompatibilität zu wahren
                         kontrapunkt.notenliste.append((midipitch_2, notenlaenge))
                     else:
+                        stats.failed_attempts += 1
+                        if self.backjumping:
+                            konflikt = set(regeln.letzter_konflikt) | konflikte.get(noten_vorher, set())
+                            self._zurueckspringen(kontrapunkt, harmonie, letzte, konflikt, ausschluss, konflikte)
+                            stats.backtrack_pops += noten_vorher - len(kontrapunkt.notenliste)
+                            einsatz = kontrapunkt.laenge()
+                            stats.deepest_rewind = max(stats.deepest_rewind, position_im_stueck - einsatz)
+                            position_im_stueck = anzahl_zaehlzeiten_2 = einsatz
+                            grenze = budget.erschoepft(stats, time.perf_counter() - t_start) if budget else None
+                            if grenze:
+                                break
+                            continue
+                        stats.backtrack_pops += noten_vorher - len(kontrapunkt.notenliste)
+                        if not kontrapunkt.notenliste:
+                            # Auch die Anfangsnote wurde zurückgenommen: sauber von vorn beginnen,
+                            # statt mit leerem Kontrapunkt vor den Anfang zurückzuspringen
+                            stats.deepest_rewind = max(stats.deepest_rewind, position_im_stueck)
+                            harmonie.interval_qualities.clear()
+                            position_im_stueck, anzahl_zaehlzeiten_2 = 0, 0
+                            grenze = budget.erschoepft(stats, time.perf_counter() - t_start) if budget else None
+                            if grenze:
+                                break
+                            continue
                         # Backtracking: an der vom Regelsystem angegebenen Position wieder ansetzen
                         if decision.retry_position is not None:
+                            stats.deepest_rewind = max(stats.deepest_rewind, position_im_stueck - decision.retry_position)
                             position_im_stueck = decision.retry_position - 1
                     anzahl_zaehlzeiten_2 = kontrapunkt.laenge()
+                    if budget is not None:
+                        grenze = budget.erschoepft(stats, time.perf_counter() - t_start)
+                        if grenze:
+                            break
 
             if ton_2[0] == True:
                 if choral.note_beginnt_gerade(position_im_stueck) == True or kontrapunkt.note_beginnt_gerade(position_im_stueck) == True:
@@ -93,4 +186,76 @@ class GenerateCounterpointUseCase:
                         (position_im_stueck, interval, harmonie.interval_quality(interval))
                     )
             position_im_stueck += 1
-        return kontrapunkt
+        stats.add_phase("search", time.perf_counter() - t_search)
+
+        if grenze is None:
+            return GenerationResult(kontrapunkt, STATUS_OK, stats)
+        if budget is None:
+            # Ohne Budget wird nie gelockert; erschöpft sein kann dann nur der Suchraum
+            raise ValueError("Zu diesem Choral existiert kein regelkonformer Kontrapunkt.")
+        if not budget.relax:
+            return GenerationResult(kontrapunkt, STATUS_PARTIAL, stats, grenze)
+        t_relax = time.perf_counter()
+        self._gelockert_ergaenzen(choral, kontrapunkt, harmonie, regeln)
+        stats.add_phase("relax", time.perf_counter() - t_relax)
+        return GenerationResult(kontrapunkt, STATUS_RELAXED, stats, grenze)
+
+    @staticmethod
+    def _zurueckspringen(kontrapunkt: Melodie, harmonie: HarmonischeStruktur, letzte: tuple[int, int],
+                         konflikt: set[int], ausschluss: dict[int, set[tuple[int, int]]],
+                         konflikte: dict[int, set[int]]) -> None:
+        """Springt zur jüngsten Note aus `konflikt` zurück (get_contra hat die letzte schon entfernt).
+
+        Deren aktueller Wert wird für das bestehende Präfix ausgeschlossen, die
+        übrigen Beteiligten gehen in ihre Konfliktmenge ein. Sind später alle
+        Werte dieser Note gescheitert, führt ihre Konfliktmenge weiter zurück.
+        Ausschlüsse und Konfliktmengen dahinter gelten nicht mehr.
+        """
+        ziel = max(konflikt)
+        # Einträge gibt es höchstens bis zur gescheiterten Note (len + 1)
+        for index in range(ziel + 1, len(kontrapunkt.notenliste) + 2):
+            ausschluss.pop(index, None)
+            konflikte.pop(index, None)
+        wert = letzte if ziel == len(kontrapunkt.notenliste) else kontrapunkt.notenliste[ziel]
+        ausschluss.setdefault(ziel, set()).add(wert)
+        konflikte.setdefault(ziel, set()).update(i for i in konflikt if i < ziel)
+        while len(kontrapunkt.notenliste) > ziel:
+            kontrapunkt.notenliste.pop()
+        # Intervalle ab dem Einsatz der Zielnote werden beim erneuten Durchlauf neu erfasst
+        einsatz = kontrapunkt.laenge()
+        qualities = harmonie.interval_qualities
+        while qualities and qualities[-1][0] >= einsatz:
+            qualities.pop()
+
+    @staticmethod
+    def _gelockert_ergaenzen(choral: Melodie, kontrapunkt: Melodie,
+                             harmonie: HarmonischeStruktur, regeln: KpRegeln) -> None:
+        """Ergänzt den Kontrapunkt bis zum Schluss des Chorals, Note gegen Note.
+
+        Geprüft werden nur noch Konsonanz, mi contra fa und (wo möglich) das
+        Melodieintervall; gewählt wird der nächstgelegene solche Ton. Die
+        Klausel wird wie in get_contra gebildet.
+        """
+        noten = choral.notenliste
+        einsaetze = noten.einsaetze()
+        klauselton = regeln.klauselton(noten)
+        position = kontrapunkt.laenge()
+        while position < einsaetze[-1]:
+            nummer = choral.get_aktuelleNotenNummer(position)
+            choralton = noten[nummer][0]
+            if nummer == len(noten) - 1:
+                ton = choralton + 12
+            elif nummer == len(noten) - 2:
+                ton = klauselton
+            else:
+                letzter_ton = kontrapunkt.notenliste[-1][0] if kontrapunkt.notenliste else choralton + 12
+                kandidaten = [
+                    c for c in f_dur[1:]
+                    if not regeln.mi_contra_fa(choralton, c)
+                    and harmonie.interval_quality(harmonie.get_interval(choralton, c)) == "Konsonanz"
+                ]
+                melodisch = [c for c in kandidaten if regeln.melodie_intervall_erlaubt(c - letzter_ton)]
+                ton = min(melodisch or kandidaten or [choralton + 12], key=lambda c: abs(c - letzter_ton))
+            dauer = einsaetze[nummer + 1] - position
+            kontrapunkt.notenliste.append((ton, dauer))
+            position += dauer
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Kompakter Event-Container für lange Stücke und Batch-Läufe (Application-Schicht).
+
+Statt eines NoteEvent-Objekts je Event werden Zeit, On/Off-Flag, Pitch und Stimme
+in parallelen typisierten Arrays (`array.array`) gehalten. Ein Event belegt damit
+wenige Bytes statt eines vollständigen Objekts mit `__dict__`.
+"""
+
+from array import array
+from typing import Iterator
+
+from .build_note_events_use_case import NoteEvent
+
+
+class NoteEventBuffer:
+    """Parallele Arrays: `ticks` (int64), `ons` (0/1), `pitches` (0..127), `voices` (0..255).
+
+    Für die Wiedergabe ohne Objekt-Erzeugung je Event können die Arrays direkt
+    (z. B. per `zip(buf.ticks, buf.ons, buf.pitches)`) durchlaufen werden;
+    `__iter__` liefert aus Kompatibilitätsgründen NoteEvent-Objekte.
+    """
+
+    __slots__ = ("ticks", "ons", "pitches", "voices")
+
+    def __init__(self) -> None:
+        self.ticks = array("q")
+        self.ons = array("B")
+        self.pitches = array("B")
+        self.voices = array("B")
+
+    def append(self, time_tick: int, on: bool, pitch: int, voice: int = 0) -> None:
+        self.ticks.append(time_tick)
+        self.ons.append(1 if on else 0)
+        self.pitches.append(pitch)
+        self.voices.append(voice)
+
+    def __len__(self) -> int:
+        return len(self.ticks)
+
+    def __iter__(self) -> Iterator[NoteEvent]:
+        for tick, on, pitch, voice in zip(self.ticks, self.ons, self.pitches, self.voices):
+            yield NoteEvent(tick, bool(on), pitch, voice)
+
+    def __getitem__(self, index: int) -> NoteEvent:
+        return NoteEvent(self.ticks[index], bool(self.ons[index]), self.pitches[index], self.voices[index])
+
+    @property
+    def nbytes(self) -> int:
+        """Belegter Nutzspeicher der Arrays in Bytes."""
+        return sum(a.itemsize * len(a) for a in (self.ticks, self.ons, self.pitches, self.voices))
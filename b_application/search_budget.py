@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Suchbudget und Ergebnis mit Status für die Kontrapunkt-Erzeugung (Application-Schicht).
+
+Ein SearchBudget begrenzt Wandzeit, Rücksprünge und get_contra-Aufrufe eines
+Laufs. Ist es erschöpft, bricht die Suche sauber ab; das GenerationResult sagt
+dann, ob der Kontrapunkt mit gelockerten Regeln vervollständigt wurde
+("relaxed") oder nur der bis dahin gefundene Anfang vorliegt ("partial").
+"""
+
+from dataclasses import dataclass
+
+from a_domain.Melodie import Melodie
+from .search_stats import SearchStats
+
+STATUS_OK = "ok"            # regelkonform und vollständig
+STATUS_RELAXED = "relaxed"  # Budget erschöpft, Rest mit gelockerten Regeln ergänzt
+STATUS_PARTIAL = "partial"  # Budget erschöpft, nur der Anfang des Kontrapunkts
+
+
+@dataclass(frozen=True)
+class SearchBudget:
+    """Obergrenzen für einen Lauf; None bedeutet unbegrenzt.
+
+    - relax: nach Erschöpfung mit gelockerten Regeln bis zum Schluss ergänzen
+      (sonst wird nur der Anfang zurückgegeben).
+    """
+
+    max_seconds: float | None = None
+    max_backtracks: int | None = None
+    max_get_contra_calls: int | None = None
+    relax: bool = True
+
+    def erschoepft(self, stats: SearchStats, sekunden: float) -> str | None:
+        """Name der überschrittenen Grenze oder None, solange das Budget reicht."""
+        if self.max_seconds is not None and sekunden >= self.max_seconds:
+            return "max_seconds"
+        if self.max_backtracks is not None and stats.backtrack_pops >= self.max_backtracks:
+            return "max_backtracks"
+        if self.max_get_contra_calls is not None and stats.get_contra_calls >= self.max_get_contra_calls:
+            return "max_get_contra_calls"
+        return None
+
+
+@dataclass(frozen=True)
+class GenerationResult:
+    """Kontrapunkt eines Laufs mit Status und Statistik (`grenze`: auslösende Budgetgrenze)."""
+
+    kontrapunkt: Melodie
+    status: str
+    stats: SearchStats
+    grenze: str | None = None
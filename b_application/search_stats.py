@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Suchstatistik für die Kontrapunkt-Erzeugung (Application-Schicht).
+
+Wird von den Generate-Use-Cases befüllt und pro Lauf zurückgegeben, damit
+langsame oder pathologische Choräle sichtbar werden.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable
+
+
+@dataclass
+class SearchStats:
+    """Zähler und Zeiten eines (oder mehrerer aggregierter) Generierungsläufe.
+
+    - candidates_per_tick: Position im Stück -> Summe der dort zulässigen Kandidaten
+      über alle get_contra-Aufrufe an dieser Position.
+    - deepest_rewind: größter Rücksprung in Zählzeiten nach einem Fehlschlag.
+    - phase_seconds: Wandzeit je Phase (z. B. "setup", "search").
+    """
+
+    runs: int = 1
+    get_contra_calls: int = 0
+    failed_attempts: int = 0
+    backtrack_pops: int = 0
+    deepest_rewind: int = 0
+    candidates_per_tick: Counter[int] = field(default_factory=Counter)
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def legal_candidates(self) -> int:
+        """Summe der zulässigen Kandidaten über alle Aufrufe (nicht: tatsächlich ausprobierte)."""
+        return sum(self.candidates_per_tick.values())
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.phase_seconds.values())
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+
+    def merge(self, other: SearchStats) -> None:
+        """Addiert die Zähler eines weiteren Laufs; deepest_rewind bleibt das Maximum."""
+        self.runs += other.runs
+        self.get_contra_calls += other.get_contra_calls
+        self.failed_attempts += other.failed_attempts
+        self.backtrack_pops += other.backtrack_pops
+        self.deepest_rewind = max(self.deepest_rewind, other.deepest_rewind)
+        self.candidates_per_tick.update(other.candidates_per_tick)
+        for name, seconds in other.phase_seconds.items():
+            self.add_phase(name, seconds)
+
+    @classmethod
+    def aggregate(cls, stats: Iterable[SearchStats]) -> SearchStats:
+        gesamt = cls(runs=0)
+        for s in stats:
+            gesamt.merge(s)
+        return gesamt
@@ -7,23 +7,81 @@ from __future__ import annotations
 Zentrale Fassade für Anwendungsfälle.
 """
 
+from random import Random
+from typing import TYPE_CHECKING, Iterable, Iterator
+
 from a_domain.Melodie import Melodie
 from a_domain.Tonleitern import f_dur
 from .generate_counterpoint_use_case import GenerateCounterpointUseCase
+from .generate_batch_use_case import CounterpointRun, GenerateCounterpointBatchUseCase
+from .forward_checking_use_case import GenerateCounterpointForwardCheckingUseCase
+from .beam_search_use_case import GenerateCounterpointBeamSearchUseCase, ScoredCounterpoint
+from .search_stats import SearchStats
 from .build_note_events_use_case import BuildNoteEventsUseCase, NoteEvent
+from .note_event_buffer import NoteEventBuffer
+
+if TYPE_CHECKING:
+    from .validate_counterpoint_use_case import Violation
 
 
 class UseCaseInteractor:
     def __init__(self, generate_uc: GenerateCounterpointUseCase,
-                 sequencer: BuildNoteEventsUseCase) -> None:
+                 sequencer: BuildNoteEventsUseCase,
+                 batch_uc: GenerateCounterpointBatchUseCase | None = None,
+                 streaming_uc: GenerateCounterpointForwardCheckingUseCase | None = None,
+                 beam_uc: GenerateCounterpointBeamSearchUseCase | None = None) -> None:
         self.generate_uc = generate_uc
         self.sequencer = sequencer
+        self.batch_uc = batch_uc or GenerateCounterpointBatchUseCase(generate_uc)
+        # Inkrementelle Erzeugung: nur die Vorwärtsprüfung liefert Noten, die nie zurückgenommen werden
+        self.streaming_uc = streaming_uc or GenerateCounterpointForwardCheckingUseCase()
+        # Die besten k Kontrapunkte aus einem Suchdurchgang
+        self.beam_uc = beam_uc or GenerateCounterpointBeamSearchUseCase()
+
+    def generate_counterpoint(self, choral: Melodie, seed: int | None = None) -> Melodie:
+        rng = Random(seed) if seed is not None else None
+        return self.generate_uc.execute(choral, rng=rng)
+
+    def generate_counterpoint_with_stats(self, choral: Melodie,
+                                         seed: int | None = None) -> tuple[Melodie, SearchStats]:
+        rng = Random(seed) if seed is not None else None
+        return self.generate_uc.execute_with_stats(choral, rng=rng)
+
+    def generate_counterpoints(self, choral: Melodie, anzahl: int, workers: int = 1,
+                               seed: int | None = None) -> list[CounterpointRun]:
+        return self.batch_uc.execute(choral, anzahl, workers=workers, seed=seed)
+
+    def iter_counterpoint_runs(self, chorale: Iterable[tuple[object, Melodie]], anzahl: int,
+                               workers: int = 1, seed: int | None = None) -> Iterator[tuple[object, CounterpointRun]]:
+        return self.batch_uc.iter_corpus(chorale, anzahl, workers=workers, seed=seed)
 
-    def generate_counterpoint(self, choral: Melodie) -> Melodie:
-        return self.generate_uc.execute(choral)
+    def generate_top_counterpoints(self, choral: Melodie, k: int | None = None,
+                                   seed: int | None = None) -> list[ScoredCounterpoint]:
+        rng = Random(seed) if seed is not None else None
+        return self.beam_uc.execute_top_k(choral, k=k, rng=rng)
+
+    def iter_top_counterpoint_runs(self, chorale: Iterable[tuple[object, Melodie]], k: int,
+                                   seed: int | None = None) -> Iterator[tuple[object, list[CounterpointRun]]]:
+        return self.beam_uc.iter_corpus(chorale, k, seed=seed)
+
+    def iter_counterpoint_notes(self, choral: Melodie, seed: int | None = None) -> Iterator[tuple[int, int]]:
+        rng = Random(seed) if seed is not None else None
+        return self.streaming_uc.iter_notes(choral, rng=rng)
 
     def build_choral(self, choral: list[tuple[int, int]]):
         return Melodie(choral, f_dur)
 
     def build_note_events(self, choral: Melodie, kontrapunkt: Melodie) -> list[NoteEvent]:
         return self.sequencer.execute(choral, kontrapunkt)
+
+    def iter_note_events(self, *stimmen: Melodie | Iterable[tuple[int, int]]) -> Iterator[NoteEvent]:
+        return self.sequencer.iter_events(*stimmen)
+
+    def build_note_event_buffer(self, *stimmen: Melodie | Iterable[tuple[int, int]]) -> NoteEventBuffer:
+        return self.sequencer.execute_buffer(*stimmen)
+
+    def validate_counterpoints(self, paare: Iterable[tuple[Melodie, Melodie]]) -> list[list[Violation]]:
+        # Lazy: NumPy wird nur für die Validierung gebraucht
+        from .validate_counterpoint_use_case import ValidateCounterpointUseCase
+
+        return ValidateCounterpointUseCase().execute_batch(paare)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Anwendungsfall: Kontrapunkte vektorisiert gegen die Regeln prüfen (Application-Schicht).
+
+Für große Mengen erzeugter Kontrapunkte ist das Nachspielen von KpRegeln und
+HarmonischeStruktur Note für Note zu langsam. Dieser Validator legt Choral und
+Kontrapunkt stattdessen als ausgerichtete Arrays ab (ein Segment je Zeitpunkt,
+an dem mindestens eine Stimme einsetzt) und prüft alle Regeln mit wenigen
+NumPy-Durchläufen. Mehrere Partituren werden dabei aneinandergehängt und in
+einem Durchgang geprüft.
+
+Die Regeln entsprechen denen der Suche (KpRegeln, Vorwaertspruefung); die
+Nachschlagetabellen werden einmalig aus deren Methoden gebaut.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from a_domain.HarmonischeStruktur import HarmonischeStruktur
+from a_domain.KpRegeln import KpRegeln
+from a_domain.Melodie import Melodie
+
+# Regelnamen in der Reihenfolge ihrer Codes
+REGELN = (
+    "laenge",        # Stimmen sind unterschiedlich lang
+    "konsonanz",     # dissonanter Zusammenklang am Einsatz einer Kontrapunktnote
+    "vorbereitung",  # Dissonanz direkt nach einer Dissonanz
+    "aufloesung",    # Dissonanz nicht 1-2 Halbtöne abwärts verlassen
+    "parallele",     # Prim-/Quint-/Oktavparallele
+    "melodie",       # Melodieintervall im Kontrapunkt nicht erlaubt
+    "mi_contra_fa",  # Tritonus zwischen den Stimmen
+)
+_LAENGE, _KONSONANZ, _VORBEREITUNG, _AUFLOESUNG, _PARALLELE, _MELODIE, _TRITONUS = range(len(REGELN))
+
+
+@dataclass(frozen=True)
+class Violation:
+    """Regelverstoß an Zählzeit `tick` (Kontrapunktnote `kontra_note`, Choralnote `choral_note`)."""
+
+    regel: str
+    tick: int
+    kontra_note: int
+    choral_note: int
+
+
+class _Tabellen:
+    """Nachschlagetabellen aus den Regelmethoden (je MIDI-Pitch bzw. Intervall)."""
+
+    def __init__(self) -> None:
+        harmonie = HarmonischeStruktur(None, None)
+        regeln = KpRegeln(harmonie, None, None)
+        # interval_quality kennt Intervalle bis zur Doppeloktave; größere gelten als Dissonanz
+        self.konsonant = np.array(
+            [i <= 24 and harmonie.interval_quality(i) == "Konsonanz" for i in range(128)], dtype=bool
+        )
+        # Index = Intervall + 127
+        self.melodisch = np.array(
+            [regeln.melodie_intervall_erlaubt(i) for i in range(-127, 128)], dtype=bool
+        )
+        self.tritonus = np.zeros((128, 128), dtype=bool)
+        toene = sorted({t for t in range(128) if any(regeln.mi_contra_fa(t, u) for u in range(128))})
+        for c in toene:
+            for k in toene:
+                self.tritonus[c, k] = regeln.mi_contra_fa(c, k)
+
+
+class ValidateCounterpointUseCase:
+    """Prüft Paare (Choral, Kontrapunkt) und liefert die Regelverstöße mit Position.
+
+    Eingabe: Melodien (oder Notenlisten [(Pitch, Dauer), ...])
+    Ausgabe: je Paar eine Liste von Violation, sortiert nach Zählzeit
+    """
+
+    _tabellen: _Tabellen | None = None
+
+    @classmethod
+    def _tab(cls) -> _Tabellen:
+        if cls._tabellen is None:
+            cls._tabellen = _Tabellen()
+        return cls._tabellen
+
+    def execute(self, choral: Melodie, kontrapunkt: Melodie) -> list[Violation]:
+        return self.execute_batch([(choral, kontrapunkt)])[0]
+
+    def execute_batch(self, paare: Iterable[tuple[Melodie, Melodie]]) -> list[list[Violation]]:
+        paare = [(_noten(c), _noten(k)) for c, k in paare]
+        if not paare:
+            return []
+        tab = self._tab()
+
+        c_pitch, c_dauer, c_anzahl = _stimme(p[0] for p in paare)
+        k_pitch, k_dauer, k_anzahl = _stimme(p[1] for p in paare)
+        c_laenge = _laengen(c_dauer, c_anzahl)
+        k_laenge = _laengen(k_dauer, k_anzahl)
+
+        # Globale Zeitachse: Partitur s beginnt bei offset[s]
+        spanne = np.maximum(c_laenge, k_laenge) + 1
+        offset = np.concatenate(([0], np.cumsum(spanne)[:-1]))
+        c_einsatz, c_score = _einsaetze(c_dauer, c_anzahl, offset)
+        k_einsatz, k_score = _einsaetze(k_dauer, k_anzahl, offset)
+
+        # Segmente: jeder Zeitpunkt, an dem mindestens eine Stimme einsetzt
+        t = np.union1d(c_einsatz, k_einsatz)
+        score = np.searchsorted(offset, t, side="right") - 1
+        ci = np.searchsorted(c_einsatz, t, side="right") - 1
+        ki = np.searchsorted(k_einsatz, t, side="right") - 1
+        lokal = t - offset[score]
+        # Nur Segmente, in denen beide Stimmen (derselben Partitur) noch klingen
+        gueltig = (
+            (ci >= 0) & (ki >= 0)
+            & (c_score[np.maximum(ci, 0)] == score) & (k_score[np.maximum(ki, 0)] == score)
+            & (lokal < c_laenge[score]) & (lokal < k_laenge[score])
+        )
+        t, score, ci, ki, lokal = t[gueltig], score[gueltig], ci[gueltig], ki[gueltig], lokal[gueltig]
+
+        c = c_pitch[ci]
+        k = k_pitch[ki]
+        c_beginnt = c_einsatz[ci] == t
+        k_beginnt = k_einsatz[ki] == t
+        intervall = k - c
+        dissonant = ~tab.konsonant[np.minimum(np.abs(intervall), 127)]
+        # Nachbarsegment derselben Partitur
+        hat_vorher = np.zeros(len(t), dtype=bool)
+        hat_vorher[1:] = score[1:] == score[:-1]
+
+        funde = [
+            # Dissonanter Zusammenklang, wo der Kontrapunkt einsetzt
+            (_KONSONANZ, dissonant & k_beginnt),
+            # Tritonus (mi contra fa)
+            (_TRITONUS, tab.tritonus[np.clip(c, 0, 127), np.clip(k, 0, 127)]),
+        ]
+        jetzt = np.flatnonzero(hat_vorher)
+        vorher = jetzt - 1
+        # Dissonanz nur nach einem konsonanten Zusammenklang
+        funde.append((_VORBEREITUNG, _an(len(t), jetzt, dissonant[jetzt] & dissonant[vorher])))
+        # Nach einer Dissonanz setzt der Kontrapunkt 1-2 Halbtöne tiefer ein
+        schritt = k[vorher] - k[jetzt]
+        funde.append((_AUFLOESUNG, _an(
+            len(t), vorher, dissonant[vorher] & k_beginnt[jetzt] & (schritt != 1) & (schritt != 2)
+        )))
+        # Parallelen: beide Stimmen bewegen sich, gleiches Intervall, Prime/Quinte/Oktave
+        funde.append((_PARALLELE, _an(len(t), jetzt, (
+            c_beginnt[jetzt] & k_beginnt[jetzt]
+            & (intervall[jetzt] == intervall[vorher])
+            & (k[jetzt] != k[vorher])
+            & np.isin(np.abs(intervall[jetzt]) % 12, (0, 7))
+        ))))
+
+        # Melodieintervalle innerhalb des Kontrapunkts (je Note gegenüber der vorigen)
+        if len(k_pitch) > 1:
+            folge = np.flatnonzero(k_score[1:] == k_score[:-1]) + 1
+            schlecht = folge[~tab.melodisch[np.clip(k_pitch[folge] - k_pitch[folge - 1], -127, 127) + 127]]
+        else:
+            schlecht = np.zeros(0, dtype=np.int64)
+
+        # Verstöße einsammeln: (Partitur, Zählzeit, Regel, Kontrapunktnote, Choralnote)
+        k_start = _starts(k_anzahl)
+        c_start = _starts(c_anzahl)
+        teile = []
+        for code, maske in funde:
+            idx = np.flatnonzero(maske)
+            s = score[idx]
+            teile.append(np.stack([s, lokal[idx], np.full(len(idx), code), ki[idx] - k_start[s], ci[idx] - c_start[s]], 1))
+        s = k_score[schlecht]
+        m_tick = k_einsatz[schlecht] - offset[s]
+        m_ci = np.searchsorted(c_einsatz, k_einsatz[schlecht], side="right") - 1
+        teile.append(np.stack([s, m_tick, np.full(len(s), _MELODIE), schlecht - k_start[s], m_ci - c_start[s]], 1))
+        falsch_lang = np.flatnonzero(c_laenge != k_laenge)
+        kuerzer = np.minimum(c_laenge, k_laenge)[falsch_lang]
+        teile.append(np.stack([
+            falsch_lang, kuerzer, np.full(len(falsch_lang), _LAENGE),
+            np.maximum(k_anzahl[falsch_lang] - 1, 0), np.maximum(c_anzahl[falsch_lang] - 1, 0),
+        ], 1))
+
+        alle = np.concatenate(teile).astype(np.int64, copy=False)
+        alle = alle[np.lexsort((alle[:, 2], alle[:, 1], alle[:, 0]))]
+        ergebnis: list[list[Violation]] = [[] for _ in paare]
+        for s, tick, code, kn, cn in alle.tolist():
+            ergebnis[s].append(Violation(REGELN[code], tick, kn, cn))
+        return ergebnis
+
+
+# --- Array-Helfer ---
+def _noten(stimme: Melodie | Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    return stimme.notenliste if isinstance(stimme, Melodie) else list(stimme)
+
+
+def _stimme(notenlisten: Iterable[list[tuple[int, int]]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Hängt die Notenlisten aller Partituren aneinander: (Pitches, Dauern, Notenanzahl je Partitur)."""
+    anzahl = []
+    flach = []
+    for noten in notenlisten:
+        anzahl.append(len(noten))
+        flach.extend(noten)
+    arr = np.array(flach, dtype=np.int64).reshape(-1, 2)
+    return arr[:, 0], arr[:, 1], np.array(anzahl, dtype=np.int64)
+
+
+def _starts(anzahl: np.ndarray) -> np.ndarray:
+    """Index der ersten Note je Partitur im aneinandergehängten Array."""
+    return np.concatenate(([0], np.cumsum(anzahl)[:-1])).astype(np.int64)
+
+
+def _laengen(dauer: np.ndarray, anzahl: np.ndarray) -> np.ndarray:
+    """Gesamtdauer je Partitur (0 für leere Stimmen)."""
+    summe = np.concatenate(([0], np.cumsum(dauer)))
+    start = _starts(anzahl)
+    return summe[start + anzahl] - summe[start]
+
+
+def _einsaetze(dauer: np.ndarray, anzahl: np.ndarray, offset: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Globale Einsatzzeiten und Partiturnummer je Note."""
+    score = np.repeat(np.arange(len(anzahl)), anzahl)
+    ende = np.cumsum(dauer)
+    # Einsatz innerhalb der Partitur = kumulierte Dauer vor der Note, ab Partiturbeginn gezählt
+    vor_partitur = np.concatenate(([0], ende))[_starts(anzahl)]
+    return ende - dauer - vor_partitur[score] + offset[score], score
+
+
+def _an(n: int, idx: np.ndarray, treffer: np.ndarray) -> np.ndarray:
+    maske = np.zeros(n, dtype=bool)
+    maske[idx[treffer]] = True
+    return maske
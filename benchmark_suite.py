@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark-Suite für die Hot Paths des Projekts
+
+Gemessen werden:
+  - GenerateCounterpointUseCase.execute  (Kontrapunkt erzeugen)
+  - BuildNoteEventsUseCase.execute       (Note-On/Off-Events bauen)
+  - MuseScoreFileExporter.export_melody  (.mscx schreiben)
+
+Eingaben sind der eingebaute Choral AppConfig.wWIHNS_1 sowie synthetische
+Choräle (a_domain.ChoralGenerator) mit 10², 10³ und 10⁴ Noten, jeweils mit
+festem Seed. Pro Messung werden Zeit (Minimum über --repeat Läufe) und
+Speicherspitze (tracemalloc, separater Lauf) erfasst; aus den synthetischen
+Größen wird je Operation ein Skalierungsexponent (Steigung im log-log-Plot)
+geschätzt.
+
+Aufrufbeispiele:
+  python3 benchmark_suite.py
+  python3 benchmark_suite.py --out bench.json --save-baseline bench_baseline.json
+  python3 benchmark_suite.py --baseline bench_baseline.json --tolerance 0.25
+
+Mit --baseline wird gegen eine gespeicherte Messung verglichen; ist eine
+Operation um mehr als --tolerance langsamer, endet das Skript mit Exit-Code 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from random import Random
+from typing import Callable
+
+from a_domain.ChoralGenerator import ChoralGenerator
+from a_domain.Melodie import Melodie
+from a_domain.Tonleitern import f_dur
+from b_application.build_note_events_use_case import BuildNoteEventsUseCase
+from b_application.generate_counterpoint_use_case import GenerateCounterpointUseCase
+from c_adapters.FileSystemAdapter import FileSystemAdapter
+from c_adapters.MuseScoreXmlAdapter import MuseScoreXmlAdapter
+from c_adapters.config import AppConfig
+from d_frameworks_drivers.musescore.config import MuseScoreConfig
+from d_frameworks_drivers.musescore.exporter import MuseScoreFileExporter
+
+SYNTHETIC_SIZES = (100, 1_000, 10_000)
+
+
+def synthetic_choral(anzahl_noten: int, seed: int) -> list[tuple[int, int]]:
+    """Synthetischer Cantus firmus mit `anzahl_noten` Noten und Tenorklausel."""
+    return ChoralGenerator(anzahl_noten=anzahl_noten, rng=Random(seed)).erzeugen()
+
+
+def _inputs(seed: int) -> list[tuple[str, list[tuple[int, int]]]]:
+    inputs = [("wWIHNS_1", list(AppConfig.wWIHNS_1))]
+    inputs += [(f"synthetic_{n}", synthetic_choral(n, seed)) for n in SYNTHETIC_SIZES]
+    return inputs
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> tuple[float, int]:
+    """Liefert (beste Zeit in Sekunden, Speicherspitze in Bytes)."""
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _scaling_exponent(points: list[tuple[int, float]]) -> float | None:
+    """Steigung der Regressionsgeraden von log(Zeit) über log(Noten)."""
+    points = [(n, t) for n, t in points if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+
+
+def run_suite(seed: int, repeat: int) -> dict:
+    generate_uc = GenerateCounterpointUseCase()
+    sequencer = BuildNoteEventsUseCase()
+    results: list[dict] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        exporter = MuseScoreFileExporter(
+            project_root=base, app_cfg=AppConfig(), ms_cfg=MuseScoreConfig(),
+            fs=FileSystemAdapter(base), xml=MuseScoreXmlAdapter(),
+        )
+        for name, noten in _inputs(seed):
+            def generate() -> Melodie:
+                # Diagnoseausgaben der Suche nicht mitmessen
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return generate_uc.execute(Melodie(list(noten), f_dur), rng=Random(seed))
+
+            choral = Melodie(list(noten), f_dur)
+            kontrapunkt = generate()
+            operations = {
+                "generate": generate,
+                "build_note_events": lambda: sequencer.execute(choral, kontrapunkt),
+                "export_musescore": lambda: exporter.export_melody(kontrapunkt),
+            }
+            for op, fn in operations.items():
+                seconds, peak = _measure(fn, repeat)
+                results.append({
+                    "op": op, "input": name, "notes": len(noten),
+                    "seconds": seconds, "peak_bytes": peak,
+                })
+                print(f"{op:<18} {name:<16} {len(noten):>6} Noten  {seconds * 1e3:10.2f} ms  {peak / 1024:10.1f} KiB")
+
+    scaling = {}
+    for op in sorted({r["op"] for r in results}):
+        points = [(r["notes"], r["seconds"]) for r in results
+                  if r["op"] == op and r["input"].startswith("synthetic_")]
+        scaling[op] = _scaling_exponent(points)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+        "scaling": scaling,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Liste der Regressionen (langsamer als Baseline * (1 + tolerance))."""
+    base = {(r["op"], r["input"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in report["results"]:
+        ref = base.get((r["op"], r["input"]))
+        if ref is None or ref["seconds"] <= 0:
+            continue
+        ratio = r["seconds"] / ref["seconds"]
+        if ratio > 1.0 + tolerance:
+            regressions.append(
+                f"{r['op']} / {r['input']}: {r['seconds'] * 1e3:.2f} ms "
+                f"(Baseline {ref['seconds'] * 1e3:.2f} ms, x{ratio:.2f})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark-Suite für Erzeugung, Event-Bau und Export")
+    p.add_argument("--seed", type=int, default=1, help="Seed für Choräle und Kontrapunkt-Erzeugung (Default: 1)")
+    p.add_argument("--repeat", type=int, default=3, help="Wiederholungen je Messung, gewertet wird das Minimum")
+    p.add_argument("--out", default="bench_results.json", help="Ausgabedatei (JSON)")
+    p.add_argument("--baseline", help="Gespeicherte Baseline (JSON) zum Vergleich")
+    p.add_argument("--tolerance", type=float, default=0.25, help="Erlaubte Verlangsamung ggü. Baseline (0.25 = 25 %%)")
+    p.add_argument("--save-baseline", help="Ergebnis zusätzlich als neue Baseline speichern")
+    args = p.parse_args(argv)
+
+    report = run_suite(seed=args.seed, repeat=max(1, args.repeat))
+    for op, exponent in report["scaling"].items():
+        text = "n/a" if exponent is None else f"{exponent:.2f}"
+        print(f"Skalierungsexponent {op:<18} {text}")
+
+    Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Ergebnisse geschrieben: {args.out}")
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Baseline gespeichert: {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("Regressionen gegenüber der Baseline:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("Keine Regressionen gegenüber der Baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,24 +3,34 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Iterable, Iterator
+
 from a_domain.Melodie import Melodie
+from a_domain.Tonleitern import f_dur
+from b_application.generate_batch_use_case import CounterpointRun
 from b_application.use_case_interactor import UseCaseInteractor
 from c_adapters.config import AppConfig
 from c_adapters.ports.score_export_port import ScoreExportPort
 from c_adapters.ports.playback_port import CounterpointPlaybackPort
+from c_adapters.ports.audio_render_port import CounterpointAudioRenderPort
 
 class TwoPartCounterpointController:
     def __init__(self,
                  config: AppConfig,
                  score_exporter: ScoreExportPort,
-                 playback_port: CounterpointPlaybackPort,
-                 interactor: UseCaseInteractor) -> None:
+                 playback_port: CounterpointPlaybackPort | None,
+                 interactor: UseCaseInteractor,
+                 audio_renderer: CounterpointAudioRenderPort | None = None) -> None:
 
         self.config = config
         # Ports/Adapter/Use-Cases (DI)
         self.score_exporter = score_exporter
+        # None im Headless-Betrieb (keine Audio-Driver geladen)
         self.playback_port = playback_port
         self.interactor = interactor
+        # Optional: Offline-Rendering (z. B. WAV ohne Soundkarte)
+        self.audio_renderer = audio_renderer
 
     def build_choral(self):
         return self.interactor.build_choral(self.config.wWIHNS_1)
@@ -32,6 +42,47 @@ class TwoPartCounterpointController:
         out_pfad = self.score_exporter.export_melody(kontrapunkt)
         print(f"MuseScore-Datei geschrieben: {out_pfad}")
 
+    def generate_corpus(self, chorale: Iterable[tuple[object, Melodie]], anzahl: int, workers: int = 1,
+                        seed: int | None = None) -> Iterator[tuple[object, CounterpointRun]]:
+        return self.interactor.iter_counterpoint_runs(chorale, anzahl, workers=workers, seed=seed)
+
+    def generate_top_corpus(self, chorale: Iterable[tuple[object, Melodie]], k: int,
+                            seed: int | None = None) -> Iterator[tuple[object, list[CounterpointRun]]]:
+        return self.interactor.iter_top_counterpoint_runs(chorale, k, seed=seed)
+
+    def export_score(self, choral: Melodie, kontrapunkt: Melodie, run_id: str | None = None,
+                     key: object | None = None) -> Path:
+        return self.score_exporter.export_score(choral, kontrapunkt, run_id=run_id, key=key)
+
+    def _playback(self) -> CounterpointPlaybackPort:
+        if self.playback_port is None:
+            raise ValueError("Keine Wiedergabe konfiguriert (Headless-Betrieb).")
+        return self.playback_port
+
     def playback_realtime(self, choral: Melodie, kontrapunkt: Melodie) -> None:
-        events = self.interactor.build_note_events(choral, kontrapunkt)
-        self.playback_port.play(events)
+        # Events werden lazy gemischt und direkt beim Abspielen konsumiert
+        events = self.interactor.iter_note_events(choral, kontrapunkt)
+        self._playback().play(events)
+
+    def render_audio(self, choral: Melodie, kontrapunkt: Melodie, out_path: Path) -> Path:
+        if self.audio_renderer is None:
+            raise ValueError("Kein Audio-Renderer konfiguriert.")
+        events = self.interactor.iter_note_events(choral, kontrapunkt)
+        pfad = self.audio_renderer.render(events, out_path)
+        print(f"Audiodatei geschrieben: {pfad}")
+        return pfad
+
+    def playback_streaming(self, choral: Melodie, seed: int | None = None) -> Melodie:
+        """Spielt den Kontrapunkt ab, während er noch erzeugt wird, und liefert ihn danach zurück."""
+        noten: list[tuple[int, int]] = []
+        strom = self.interactor.iter_counterpoint_notes(choral, seed=seed)
+
+        def mitschreiben():
+            for note in strom:
+                noten.append(note)
+                yield note
+
+        self._playback().play(self.interactor.iter_note_events(choral, mitschreiben()))
+        # Nach einem Abbruch der Wiedergabe den Rest ohne Ton fertig erzeugen
+        noten.extend(strom)
+        return Melodie(noten, f_dur)
@@ -8,16 +8,26 @@ Gemäß Clean Architecture gehören framework-/format-spezifische Details
 allgemeine FS-Helfer bereit, die von äußeren Schichten genutzt werden
 können (z. B. Lesen/Schreiben von Dateien, Verzeichnisse anlegen,
 Pfade relativ zum Projekt-Root auflösen).
+
+Schreibzugriffe sind atomar: Inhalte landen zuerst in einer temporären Datei
+im Zielverzeichnis und ersetzen die Zieldatei erst danach per Umbenennen. Ein
+Absturz hinterlässt damit nie eine halb geschriebene Ausgabedatei.
 """
 
 from __future__ import annotations
 
+import os
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
+from typing import IO, Callable, Iterator
 
 class FileSystemAdapter:
-    def __init__(self, base_path: Path) -> None:
+    def __init__(self, base_path: Path, fsync: bool = True) -> None:
         # base_path zeigt auf das Projekt-Root
         self.base_path = base_path
+        # fsync: Inhalte vor dem Umbenennen auf den Datenträger zwingen (auch bei Stromausfall konsistent)
+        self.fsync = fsync
 
     # --- Pfadfunktionen ---
     def resolve_path(self, rel_or_abs: Path) -> Path:
@@ -37,11 +47,75 @@ class FileSystemAdapter:
         return d
 
     # --- Schreiben ---
-    def write_text(self, file_path: Path, content: str, encoding: str = "utf-8") -> Path:
-        """Schreibt Textinhalt in eine Datei, legt Elternverzeichnisse bei Bedarf an, und gibt den Pfad zurück."""
+    @contextmanager
+    def _atomar(self, p: Path, mode: str, encoding: str | None,
+                abschliessen: Callable[[Path], None]) -> Iterator[IO]:
+        """Schreibt in eine temporäre Datei neben `p` und übergibt sie danach an `abschliessen`.
+
+        Die temporäre Datei wird in jedem Fall entfernt (nach os.replace ist sie
+        schon fort); scheitert das Schreiben, entsteht keine Zieldatei.
+        """
+        tmp = p.with_name(f".{p.name}.{uuid.uuid4().hex}.tmp")
+        if "b" in mode:
+            encoding = None
+        try:
+            with open(tmp, mode, encoding=encoding) as out:
+                yield out
+                out.flush()
+                if self.fsync:
+                    os.fsync(out.fileno())
+            abschliessen(tmp)
+        finally:
+            try:
+                tmp.unlink()
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def open_atomic(self, file_path: Path, mode: str = "w", encoding: str | None = "utf-8") -> Iterator[IO]:
+        """Öffnet eine temporäre Datei neben `file_path`; erst nach fehlerfreiem Ende
+        des with-Blocks wird sie per os.replace an ihren Zielort umbenannt."""
         p = self.resolve_path(file_path)
-        parent = p.parent
-        parent.mkdir(parents=True, exist_ok=True)
-        with open(p, "w", encoding=encoding) as out:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with self._atomar(p, mode, encoding, lambda tmp: os.replace(tmp, p)) as out:
+            yield out
+
+    def write_unique(self, directory: Path, stem: str, suffix: str, schreiben: Callable[[IO], None],
+                     mode: str = "wb", encoding: str | None = None) -> Path:
+        """Schreibt über `schreiben` eine neue Datei `<stem><suffix>` (belegt: `<stem>-2<suffix>`, ...).
+
+        Der Name wird erst vergeben, wenn der Inhalt vollständig geschrieben ist:
+        os.link der fertigen temporären Datei scheitert, wenn der Name schon
+        existiert (auch bei gleichzeitigen Threads und Prozessen), dann wird der
+        nächste versucht. Scheitert das Schreiben, bleibt keine Datei zurück.
+        """
+        d = self.ensure_dir(directory)
+        ziel: list[Path] = []
+
+        def verlinken(tmp: Path) -> None:
+            n = 1
+            while True:
+                kandidat = d / (f"{stem}{suffix}" if n == 1 else f"{stem}-{n}{suffix}")
+                try:
+                    os.link(tmp, kandidat)
+                except FileExistsError:
+                    n += 1
+                    continue
+                ziel.append(kandidat)
+                return
+
+        with self._atomar(d / f"{stem}{suffix}", mode, encoding, verlinken) as out:
+            schreiben(out)
+        return ziel[0]
+
+    def write_text(self, file_path: Path, content: str, encoding: str = "utf-8") -> Path:
+        """Schreibt Textinhalt atomar in eine Datei, legt Elternverzeichnisse bei Bedarf an, und gibt den Pfad zurück."""
+        with self.open_atomic(file_path, "w", encoding=encoding) as out:
             out.write(content)
-        return p
+        return self.resolve_path(file_path)
+
+    def write_bytes(self, file_path: Path, data: bytes) -> Path:
+        """Schreibt Binärinhalt atomar in eine Datei, legt Elternverzeichnisse bei Bedarf an, und gibt den Pfad zurück."""
+        with self.open_atomic(file_path, "wb") as out:
+            out.write(data)
+        return self.resolve_path(file_path)
@@ -7,6 +7,9 @@ from pathlib import Path
 import xml.etree.ElementTree as ET
 
 
+_EINFUEGEMARKE = "KpEinfuegemarke"
+
+
 class MuseScoreXmlAdapter:
     """MuseScore-spezifische XML-Helfer (ElementTree-basiert).
 
@@ -22,6 +25,31 @@ class MuseScoreXmlAdapter:
         out_path.parent.mkdir(parents=True, exist_ok=True)
         tree.write(out_path, encoding="utf-8", xml_declaration=True)
 
+    # --- Serialisierung ---
+    def split_at(self, root: ET.Element, container: ET.Element, index: int) -> tuple[bytes, bytes]:
+        """Serialisiert das Dokument und teilt es an Position `index` in `container`.
+
+        Liefert (Kopf, Rest) als UTF-8-Bytes inkl. XML-Deklaration, sodass
+        Kopf + serialisierte Elemente + Rest dem Einfügen an dieser Stelle entspricht.
+        """
+        marke = ET.Element(_EINFUEGEMARKE)
+        container.insert(index, marke)
+        try:
+            data = ET.tostring(root, encoding="utf-8", xml_declaration=True)
+        finally:
+            container.remove(marke)
+        kopf, gefunden, rest = data.partition(f"<{_EINFUEGEMARKE} />".encode("utf-8"))
+        if not gefunden:
+            raise ValueError("Einfügemarke nach dem Serialisieren nicht gefunden")
+        return kopf, rest
+
+    def serialize_elements(self, elements: list[ET.Element]) -> bytes:
+        return b"".join(ET.tostring(el, encoding="utf-8") for el in elements)
+
+    def validate_fragment(self, fragment: bytes) -> None:
+        """Prüft ein XML-Fragment (mehrere Geschwisterknoten) im Speicher auf Wohlgeformtheit."""
+        ET.fromstring(b"<fragment>" + fragment + b"</fragment>")
+
     # --- Suche / Navigation ---
     def find_staff_measure(self, root: ET.Element, staff_id: str = "1", measure_number: str = "1") -> ET.Element:
         staff = None
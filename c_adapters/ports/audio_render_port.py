@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable
+
+from b_application.build_note_events_use_case import NoteEvent
+
+
+class CounterpointAudioRenderPort(ABC):
+    """Abstrakte Schnittstelle für das Offline-Rendern eines Kontrapunkts in eine Audiodatei."""
+
+    @abstractmethod
+    def render(self, events: Iterable[NoteEvent], out_path: Path) -> Path:
+        """Rendert die Events ohne Echtzeitbindung nach `out_path` und liefert den Pfad zurück.
+
+        `events` muss zeitlich geordnet sein und darf ein Generator sein; er wird
+        genau einmal durchlaufen.
+        """
+        raise NotImplementedError
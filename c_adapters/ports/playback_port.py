@@ -5,6 +5,8 @@ from __future__ import annotations
 
 
 from abc import ABC, abstractmethod
+from typing import Iterable
+
 from b_application.build_note_events_use_case import NoteEvent
 
 
@@ -12,8 +14,11 @@ class CounterpointPlaybackPort(ABC):
     """Abstrakte Schnittstelle für das Abspielen eines zweistimmigen Kontrapunkts."""
 
     @abstractmethod
-    def play(self, events : list[NoteEvent]) -> None:
+    def play(self, events: Iterable[NoteEvent]) -> None:
         """Startet die Wiedergabe entsprechend der Angaben im Request und blockiert,
         bis die Wiedergabe abgeschlossen ist oder abgebrochen wurde.
+
+        `events` muss zeitlich geordnet sein und darf ein Generator sein; er wird
+        genau einmal durchlaufen.
         """
         raise NotImplementedError
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Iterable
 
 from a_domain.Melodie import Melodie
 
@@ -20,3 +21,19 @@ class ScoreExportPort(ABC):
     def export_melody(self, melody: Melodie) -> Path:
         """Exportiert die übergebene Melodie und liefert den Ausgabepfad zurück."""
         raise NotImplementedError
+
+    def export_melodies(self, melodies: Iterable[Melodie]) -> list[Path]:
+        """Exportiert mehrere Melodien und liefert die Ausgabepfade in Eingabereihenfolge.
+
+        Standard: nacheinander über export_melody; Implementierungen dürfen parallelisieren.
+        """
+        return [self.export_melody(melody) for melody in melodies]
+
+    def export_score(self, choral: Melodie, melody: Melodie, run_id: str | None = None,
+                     key: object | None = None) -> Path:
+        """Exportiert Melodie und (beliebigen) Choral gemeinsam und liefert den Ausgabepfad.
+
+        Mit `key` ergibt sich der Dateiname deterministisch aus `run_id` und `key`
+        (z. B. Choralname und Laufindex), sonst aus einem Zeitstempel.
+        """
+        raise NotImplementedError
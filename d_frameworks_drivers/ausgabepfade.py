@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Gemeinsame Dateinamen aller Exporter (Frameworks/Drivers-Schicht).
+
+- Einzelexport: `<prefix><Zeitstempel><endung>`; mehrere Exporte in derselben
+  Sekunde erhalten ein Suffix (-2, -3, ...). Der FileSystemAdapter vergibt
+  den Namen erst für die fertig geschriebene Datei.
+- Bulk-Export: `<prefix><run_id>_<key><endung>`, deterministisch aus Lauf-ID
+  und Schlüssel (z. B. Index oder Choralname und Laufindex).
+"""
+
+import time
+import uuid
+from pathlib import Path
+from typing import IO, Callable, Protocol
+
+from c_adapters.FileSystemAdapter import FileSystemAdapter
+
+
+class _ExportConfig(Protocol):
+    out_dirname: str
+    filename_prefix: str
+
+
+def new_run_id() -> str:
+    """Lauf-ID aus Zeitstempel und Zufallsanteil, eindeutig auch bei gleichzeitigem Start."""
+    return f"{time.strftime('%b%d.%H-%M-%S')}-{uuid.uuid4().hex[:8]}"
+
+
+class Ausgabepfade:
+    """Ausgabepfade eines Exporters; Verzeichnis und Präfix kommen bei jedem Aufruf aus der Config."""
+
+    def __init__(self, fs: FileSystemAdapter, cfg: _ExportConfig, endung: str) -> None:
+        self.fs = fs
+        self.cfg = cfg
+        self.endung = endung
+
+    def einzeln_schreiben(self, schreiben: Callable[[IO], None], mode: str = "wb",
+                          encoding: str | None = None) -> Path:
+        stamm = f"{self.cfg.filename_prefix}{time.strftime('%b%d.%H-%M-%S')}"
+        return self.fs.write_unique(Path(self.cfg.out_dirname), stamm, self.endung, schreiben, mode, encoding)
+
+    def lauf(self, run_id: str, key: object) -> Path:
+        name = f"{self.cfg.filename_prefix}{run_id}_{key}{self.endung}"
+        return self.fs.ensure_dir(Path(self.cfg.out_dirname)) / name
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+
+class MidiFileConfig:
+    """Konfiguration für den Export als Standard MIDI File (.mid, Typ 1) (Driver-Schicht).
+    """
+
+    # Ausgabeverzeichnis und Dateiname
+    out_dirname: str = "Kontrapunkte"
+    filename_prefix: str = "wWIHNS_mitKontrapunkt_"
+
+    # Auflösung: Ticks je Viertel (eine Achtel = 1 Zählzeit = ticks_per_quarter // 2)
+    ticks_per_quarter: int = 480
+    # Tempo in Mikrosekunden je Viertel (500000 = 120 BPM, entspricht tick_seconds=0.25 der Wiedergabe)
+    tempo_us_per_quarter: int = 500_000
+    # Taktart für das Tempo-Track (Zähler, Nenner)
+    time_signature: tuple[int, int] = (4, 4)
+
+    # Je Stimme (0 = Choral, 1 = Kontrapunkt): Spurname und GM-Programm; Kanal = Stimmindex
+    track_names: tuple[str, ...] = ("Choral", "Kontrapunkt")
+    programs: tuple[int, ...] = (0, 0)
+    velocity: int = 100
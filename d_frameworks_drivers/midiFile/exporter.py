@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Export als Standard MIDI File, Typ 1 (Frameworks/Drivers-Schicht).
+
+Aufbau der Datei:
+- Track 0: Tempo, Taktart (keine Noten),
+- Track 1..n: je Stimme ein Track auf eigenem Kanal (Stimme 0 = Choral).
+
+Die Note-On/Off-Events kommen aus dem BuildNoteEventsUseCase und werden in
+einem Durchlauf auf die Tracks verteilt. Zeiten stehen als Delta-Zeiten
+(variable Länge) im Track; Note-Off wird als Note-On mit Velocity 0 kodiert,
+so dass innerhalb eines Tracks Running Status greift und das Statusbyte nur
+einmal geschrieben wird. Die fertigen Bytes werden in einem Stück atomar
+geschrieben.
+"""
+
+import struct
+from pathlib import Path
+
+from a_domain.Melodie import Melodie
+from a_domain.Tonleitern import f_dur
+from b_application.build_note_events_use_case import BuildNoteEventsUseCase
+from c_adapters.config import AppConfig
+from c_adapters.FileSystemAdapter import FileSystemAdapter
+from c_adapters.ports.score_export_port import ScoreExportPort
+from d_frameworks_drivers.ausgabepfade import Ausgabepfade, new_run_id
+from .config import MidiFileConfig
+
+_NOTE_ON = 0x90
+_PROGRAM_CHANGE = 0xC0
+_END_OF_TRACK = b"\x00\xff\x2f\x00"
+
+
+def _vlq(wert: int) -> bytes:
+    """Variable-Length Quantity: 7 Bit je Byte, höchstes Bit = Fortsetzung."""
+    puffer = bytearray([wert & 0x7F])
+    wert >>= 7
+    while wert:
+        puffer.append((wert & 0x7F) | 0x80)
+        wert >>= 7
+    puffer.reverse()
+    return bytes(puffer)
+
+
+def _meta(typ: int, daten: bytes) -> bytes:
+    return b"\x00\xff" + bytes([typ]) + _vlq(len(daten)) + daten
+
+
+def _chunk(kennung: bytes, daten: bytes | bytearray) -> bytes:
+    return kennung + struct.pack(">I", len(daten)) + daten
+
+
+class _Spur:
+    """Ein Noten-Track im Aufbau: Delta-Zeiten und Running Status je Kanal."""
+
+    __slots__ = ("daten", "letzter_tick", "status")
+
+    def __init__(self, name: str, kanal: int, programm: int) -> None:
+        self.daten = bytearray(_meta(0x03, name.encode("utf-8")))
+        self.daten += bytes([0, _PROGRAM_CHANGE | kanal, programm & 0x7F])
+        self.letzter_tick = 0
+        self.status = _NOTE_ON | kanal
+
+    def note(self, tick: int, pitch: int, velocity: int, erstes: bool) -> None:
+        self.daten += _vlq(tick - self.letzter_tick)
+        self.letzter_tick = tick
+        if erstes:
+            # Nach dem Program Change einmal das Note-On-Status, danach Running Status
+            self.daten.append(self.status)
+        self.daten += bytes([pitch & 0x7F, velocity])
+
+
+class MidiFileExporter(ScoreExportPort):
+    """Schreibt Choral und Kontrapunkt als zweistimmiges Standard MIDI File (Typ 1)."""
+
+    def __init__(self, project_root: Path, app_cfg: AppConfig,
+                 midi_cfg: MidiFileConfig,
+                 fs: FileSystemAdapter,
+                 sequencer: BuildNoteEventsUseCase | None = None) -> None:
+        self.project_root = project_root
+        self.app_cfg = app_cfg
+        self.midi = midi_cfg
+        self.fs = fs
+        self.sequencer = sequencer or BuildNoteEventsUseCase()
+        self._pfade = Ausgabepfade(fs, midi_cfg, ".mid")
+
+    # --- interne Helfer ---
+    new_run_id = staticmethod(new_run_id)
+
+    def _tempo_track(self) -> bytes:
+        zaehler, nenner = self.midi.time_signature
+        daten = _meta(0x51, self.midi.tempo_us_per_quarter.to_bytes(3, "big"))
+        # Taktart: Nenner als Zweierpotenz, 24 MIDI-Clocks je Metronomschlag, 8 32tel je Viertel
+        daten += _meta(0x58, bytes([zaehler, nenner.bit_length() - 1, 24, 8]))
+        return _chunk(b"MTrk", daten + _END_OF_TRACK)
+
+    def to_bytes(self, *stimmen: Melodie) -> bytes:
+        """Kodiert die Stimmen (Reihenfolge = Track/Kanal) als SMF Typ 1."""
+        if len(stimmen) > 16:
+            raise ValueError("Ein MIDI-Port hat höchstens 16 Kanäle")
+        skala = self.midi.ticks_per_quarter // 2  # Achtel -> MIDI-Ticks
+        spuren = []
+        for voice in range(len(stimmen)):
+            name = self.midi.track_names[voice] if voice < len(self.midi.track_names) else f"Stimme {voice + 1}"
+            programm = self.midi.programs[voice] if voice < len(self.midi.programs) else 0
+            spuren.append(_Spur(name, voice, programm))
+        begonnen = [False] * len(spuren)
+
+        for ev in self.sequencer.iter_events(*stimmen):
+            spur = spuren[ev.voice]
+            spur.note(ev.time_tick * skala, ev.pitch, self.midi.velocity if ev.on else 0, not begonnen[ev.voice])
+            begonnen[ev.voice] = True
+
+        teile = [
+            _chunk(b"MThd", struct.pack(">HHH", 1, len(spuren) + 1, self.midi.ticks_per_quarter)),
+            self._tempo_track(),
+        ]
+        teile += [_chunk(b"MTrk", spur.daten + _END_OF_TRACK) for spur in spuren]
+        return b"".join(teile)
+
+    # --- Port-Implementierung ---
+    def export_melody(self, melody: Melodie) -> Path:
+        """Exportiert die Melodie zum Choral aus AppConfig (wWIHNS_1), wie das MuseScore-Template.
+
+        Für einen beliebigen Choral: export_score.
+        """
+        return self.export_score(Melodie(list(self.app_cfg.wWIHNS_1), f_dur), melody)
+
+    def export_score(self, choral: Melodie, melody: Melodie, run_id: str | None = None,
+                     key: object | None = None) -> Path:
+        """Exportiert Choral (Track 1) und Melodie (Track 2) als .mid."""
+        # Erst kodieren, dann den Pfad vergeben: ein Kodierfehler hinterlässt keine Datei
+        daten = self.to_bytes(choral, melody)
+        if key is None:
+            return self._pfade.einzeln_schreiben(lambda out: out.write(daten))
+        return self.fs.write_bytes(self._pfade.lauf(run_id or self.new_run_id(), key), daten)
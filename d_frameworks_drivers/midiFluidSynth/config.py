@@ -27,6 +27,9 @@ class PlaybackSettings:
     # Zeitsteuerung
     tick_seconds: float
     fadeout_seconds: float
+    scheduling: str
+    sequencer_latency_ms: int
+    sequencer_lookahead_ms: int
 
     # Audio / Synth
     samplerate: float
@@ -41,12 +44,20 @@ class PlaybackSettings:
     # Presets (bank, program)
     presets: tuple[tuple[int, int], ...]
 
+    # Offline-Rendering: Frames je get_samples-Aufruf
+    render_block_frames: int
+
 
 @dataclass
 class MidiFluidSynthConfig:
     # Zeitsteuerung
     tick_seconds: float = 0.25
     fadeout_seconds: float = 1.0
+    # "sequencer": sampelgenau über den FluidSynth-Sequencer, "sleep": Python-Schleife mit time.sleep
+    scheduling: str = "sequencer"
+    # Vorlauf vor dem ersten Event und Einstell-Horizont des Sequencers (Millisekunden)
+    sequencer_latency_ms: int = 100
+    sequencer_lookahead_ms: int = 2000
 
     # Audio / Synth
     samplerate: float = 44100.0
@@ -64,6 +75,9 @@ class MidiFluidSynthConfig:
     # GM-Preset-Reihenfolge (bank, program), z. B. Piano (0), Tenor Sax (65)
     presets: list[tuple[int, int]] = field(default_factory=lambda: [(0, 0), (0, 65)])
 
+    # Offline-Rendering (WAV): Frames, die pro Block aus dem Synth gezogen werden
+    render_block_frames: int = 4096
+
     # SoundFont
     sf_local_relpath: Path = Path("d_frameworks_drivers") / "midiFluidSynth" / "soundFonts" / "1276-soft_tenor_sax.sf2"
 
@@ -72,15 +86,24 @@ class MidiFluidSynthConfig:
         for drv in self.fallback_drivers:
             yield drv
 
+    SCHEDULING_MODES = ("sequencer", "sleep")
+
     def to_settings(self) -> PlaybackSettings:
         """Erzeugt PlaybackSettings für den FluidSynth-Driver.
 
         Hinweis: Der SoundFont-Pfad ist kein Teil der Settings, sondern wird im
         Driver selbst (_choose_soundfont) ermittelt.
         """
+        if self.scheduling not in self.SCHEDULING_MODES:
+            raise ValueError(
+                f"Unbekannter Scheduling-Modus '{self.scheduling}', erlaubt: {', '.join(self.SCHEDULING_MODES)}"
+            )
         return PlaybackSettings(
             tick_seconds=self.tick_seconds,
             fadeout_seconds=self.fadeout_seconds,
+            scheduling=self.scheduling,
+            sequencer_latency_ms=self.sequencer_latency_ms,
+            sequencer_lookahead_ms=self.sequencer_lookahead_ms,
             samplerate=self.samplerate,
             gain=self.gain,
             drivers=tuple(self.iter_audio_drivers()),
@@ -88,4 +111,5 @@ class MidiFluidSynthConfig:
             cc_volume=self.cc_volume,
             cc_expression=self.cc_expression,
             presets=tuple(self.presets),
+            render_block_frames=self.render_block_frames,
         )
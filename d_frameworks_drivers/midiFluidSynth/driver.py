@@ -8,83 +8,60 @@ from __future__ import annotations
 Diese Klasse implementiert den CounterpointPlaybackPort und kapselt die
 gesamte FluidSynth-/MIDI-Echtzeitlogik. Dadurch bleibt die Adapter-/
 Controller-Schicht frei von FluidSynth-Details (Clean Architecture).
+
+Synth, SoundFont und Audio-Treiber werden beim ersten play() angelegt und für
+alle weiteren Wiedergaben behalten; close() gibt sie wieder frei.
+
+Zeitsteuerung (MidiFluidSynthConfig.scheduling):
+- "sequencer": Events werden zeitgestempelt in den FluidSynth-Sequencer
+  gestellt und sampelgenau ausgespielt (Standard),
+- "sleep": Python schläft bis zu jedem Event und ruft noteon/noteoff selbst.
+
+Nach jeder Wiedergabe steht in `last_timing_report` ein PlaybackTimingReport
+mit den Verspätungen der Events (beim Sequencer: Einstellen nach dem
+geplanten Zeitpunkt).
 """
 
 import time
+from array import array
 from pathlib import Path
+from typing import Iterable
 
 from c_adapters.ports.playback_port import CounterpointPlaybackPort
 from b_application.build_note_events_use_case import NoteEvent
+from b_application.note_event_buffer import NoteEventBuffer
 from .config import MidiFluidSynthConfig
-import fluidsynth
+from .synth import choose_soundfont, create_synth
+from .timing import PlaybackTimingReport
+
+
+def _event_folge(events: Iterable[NoteEvent]) -> Iterable[tuple[int, bool, int]]:
+    """(tick, on, pitch) je Event; ein NoteEventBuffer wird direkt über seine Arrays gelesen."""
+    if isinstance(events, NoteEventBuffer):
+        return zip(events.ticks, events.ons, events.pitches)
+    return ((ev.time_tick, ev.on, ev.pitch) for ev in events)
 
 
 class FluidSynthPlaybackDriver(CounterpointPlaybackPort):
     def __init__(self, project_root: Path, cfg: MidiFluidSynthConfig | None = None) -> None:
         self.project_root = project_root
         self.cfg = cfg or MidiFluidSynthConfig()
+        # Langlebiger Synth (lazy beim ersten play angelegt)
+        self._fl = None
+        # Timing der letzten Wiedergabe (None, solange nichts abgespielt wurde)
+        self.last_timing_report: PlaybackTimingReport | None = None
 
     # --- interne Helfer ---
     def _choose_soundfont(self) -> str:
-        """Ermittelt den SoundFont ausschließlich aus dem paketlokalen Ordner.
-
-        Zugelassener Suchort:
-        - d_frameworks_drivers/midiFluidSynth/soundFonts/
-        """
-        pkg_sf_dir = (self.project_root / "d_frameworks_drivers" / "midiFluidSynth" / "soundFonts").resolve()
-
-        # Präferenz: in der Config angegebener lokale Standard (liegt ebenfalls unterhalb des Paketordners)
-        cfg_local = (self.project_root / self.cfg.sf_local_relpath).resolve()
-        if cfg_local.exists():
-            return str(cfg_local)
-
-        # Feste Kandidaten im paketlokalen Ordner
-        pkg_candidates = [
-            pkg_sf_dir / "1276-soft_tenor_sax.sf2",
-            pkg_sf_dir / "alto_sax_2.sf2",
-            pkg_sf_dir / "example.sf2",
-        ]
-        for c in pkg_candidates:
-            if c.exists():
-                return str(c)
-
-        # Nichts gefunden: klare Fehlermeldung (nur paketlokaler Ort wird unterstützt)
-        raise FileNotFoundError(
-            "Kein SoundFont gefunden. Lege eine .sf2 in d_frameworks_drivers/midiFluidSynth/soundFonts/."
-        )
+        return choose_soundfont(self.project_root, self.cfg)
 
     def configureFluidSynth(self):
 
         # Wiedergabe-Parameter on-demand aus der Driver-Konfiguration ableiten
         settings = self.cfg.to_settings()
         try:
-            # Synth initialisieren
-            fl = fluidsynth.Synth(samplerate=settings.samplerate, gain=settings.gain)
-
-            # SoundFont wählen und laden
-            sf_path = self._choose_soundfont()
-            if not Path(sf_path).exists():
-                raise FileNotFoundError(
-                    f"Kein gültiger SoundFont gefunden (versucht: {sf_path}). "
-                    "Lege eine .sf2 in d_frameworks_drivers/midiFluidSynth/soundFonts/."
-                )
-            sfid = fl.sfload(sf_path)
-
-            # Preset auswählen (erste funktionierende Kombination verwenden)
-            preset_selected = False
-            for bank, program in settings.presets:
-                try:
-                    fl.program_select(0, sfid, bank, program)
-                    preset_selected = True
-                    break
-                except Exception:
-                    print("Soundfont didnt work")
-            if not preset_selected:
-                # Fallback: GM Piano
-                try:
-                    fl.program_select(0, sfid, 0, 0)
-                except Exception:
-                    pass
+            # Synth mit SoundFont und Preset initialisieren
+            fl = create_synth(self.project_root, self.cfg, settings)
 
             # Audio-Treiber starten (z. B. pulseaudio → pipewire)
             last_err = None
@@ -100,44 +77,115 @@ class FluidSynthPlaybackDriver(CounterpointPlaybackPort):
             if last_err is not None:
                 raise last_err
 
-            # Lautstärke sicherheitshalber hochziehen
-            try:
-                fl.cc(0, 7, settings.cc_volume)      # CC7 Volume
-                fl.cc(0, 11, settings.cc_expression)  # CC11 Expression
-            except Exception:
-                pass
-
             return fl
         except Exception:
             print("Something went wrong configuring Midi-Driver")
 
 
-    # --- Port-Implementierung ---
-    def play(self, events : list[NoteEvent]) -> None:
-        fl = self.configureFluidSynth()
-        settings = self.cfg.to_settings()
+    def _ensure_synth(self):
+        """Liefert den langlebigen Synth und legt ihn beim ersten Aufruf an."""
+        if self._fl is None:
+            self._fl = self.configureFluidSynth()
+        return self._fl
+
+    # --- Lebenszyklus ---
+    def reset(self) -> None:
+        """Beendet alle klingenden Noten, ohne Synth und SoundFont freizugeben."""
+        if self._fl is None:
+            return
         try:
-            # Zeitgesteuerte Echtzeit-Schleife (Event-basiert)
-            t0 = time.perf_counter()
-            for ev in events:
-                target = t0 + ev.time_tick * settings.tick_seconds
-                now = time.perf_counter()
-                sleep_time = target - now
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                if ev.on:
-                    fl.noteon(0, ev.pitch, settings.midi_velocity)
+            self._fl.cc(0, 123, 0)  # CC123 All Notes Off
+            self._fl.cc(0, 120, 0)  # CC120 All Sound Off (auch Ausklang/Hall)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Gibt Synth, Audio-Treiber und SoundFont frei; ein späteres play() legt sie neu an."""
+        fl, self._fl = self._fl, None
+        if fl is not None:
+            try:
+                fl.delete()
+            except Exception:
+                pass
+
+    # --- Zeitsteuerung ---
+    def _play_sleep(self, fl, events: Iterable[NoteEvent], settings, verspaetung: array) -> None:
+        """Echtzeit-Schleife in Python: schlafen bis zum Event, dann noteon/noteoff."""
+        t0 = time.perf_counter()
+        for tick, on, pitch in _event_folge(events):
+            target = t0 + tick * settings.tick_seconds
+            now = time.perf_counter()
+            sleep_time = target - now
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            verspaetung.append(time.perf_counter() - target)
+            if on:
+                fl.noteon(0, pitch, settings.midi_velocity)
+            else:
+                fl.noteoff(0, pitch)
+
+        # Ausklang
+        time.sleep(max(0.0, settings.fadeout_seconds))
+
+    @staticmethod
+    def _warten_bis(seq, ziel_ms: int) -> None:
+        # In kurzen Schritten schlafen, damit Strg+C zeitnah ankommt
+        while (rest := ziel_ms - seq.get_tick()) > 0:
+            time.sleep(min(rest, 50) / 1000.0)
+
+    def _play_sequencer(self, fl, events: Iterable[NoteEvent], settings, verspaetung: array) -> None:
+        """Events mit absoluten Zeitstempeln in den FluidSynth-Sequencer stellen.
+
+        Der Sequencer läuft ohne System-Timer auf der Sample-Uhr des Synths; die
+        Noten erklingen damit sampelgenau, unabhängig von GIL und Scheduler.
+        Python stellt nur bis `sequencer_lookahead_ms` im Voraus ein, damit auch
+        lazy erzeugte Event-Ströme und Strg+C funktionieren.
+        """
+        import fluidsynth
+
+        seq = fluidsynth.Sequencer(time_scale=1000, use_system_timer=False)
+        try:
+            synth_id = seq.register_fluidsynth(fl)
+            ms_per_tick = settings.tick_seconds * 1000.0
+            # Kleiner Vorlauf, damit schon das erste Event rechtzeitig in der Queue liegt
+            start = seq.get_tick() + settings.sequencer_latency_ms
+            ende = start
+            for tick, on, pitch in _event_folge(events):
+                zeit = start + round(tick * ms_per_tick)
+                self._warten_bis(seq, zeit - settings.sequencer_lookahead_ms)
+                # Zu spät ist ein Event nur, wenn es erst nach seinem Zeitpunkt eingestellt wird
+                verspaetung.append((seq.get_tick() - zeit) / 1000.0)
+                if on:
+                    seq.note_on(zeit, 0, pitch, settings.midi_velocity, dest=synth_id)
                 else:
-                    fl.noteoff(0, ev.pitch)
+                    seq.note_off(zeit, 0, pitch, dest=synth_id)
+                ende = zeit
 
-            # Ausklang
-            time.sleep(max(0.0, settings.fadeout_seconds))
+            # Warten, bis alles erklungen ist, plus Ausklang
+            self._warten_bis(seq, ende + round(max(0.0, settings.fadeout_seconds) * 1000.0))
+        finally:
+            # Löschen verwirft noch nicht ausgespielte Events (z. B. nach Strg+C)
+            seq.delete()
 
+    # --- Port-Implementierung ---
+    def play(self, events: Iterable[NoteEvent]) -> None:
+        fl = self._ensure_synth()
+        if fl is None:
+            return
+        settings = self.cfg.to_settings()
+        verspaetung = array("d")
+        try:
+            if settings.scheduling == "sequencer":
+                self._play_sequencer(fl, events, settings, verspaetung)
+            else:
+                self._play_sleep(fl, events, settings, verspaetung)
         except KeyboardInterrupt:
             print("Abbruch per Strg+C während der Audioausgabe.")
         finally:
-            try:
-                if fl is not None:
-                    fl.delete()
-            except Exception:
-                pass
+            # Synth bleibt für die nächste Wiedergabe erhalten, nur hängende Noten beenden
+            self.reset()
+            self.last_timing_report = PlaybackTimingReport.from_lateness(
+                verspaetung, settings.scheduling, settings.tick_seconds
+            )
+            if self.last_timing_report.late_over_tick:
+                print(f"Warnung: {self.last_timing_report.summary()}")
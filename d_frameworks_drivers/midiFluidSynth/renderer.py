@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""FluidSynth-basierter WAV-Renderer (Frameworks/Drivers-Schicht).
+
+Implementiert den CounterpointAudioRenderPort: Derselbe NoteEvent-Strom wie
+beim Playback wird in einen Synth OHNE Audio-Treiber gespeist. Statt zu
+schlafen, zieht der Renderer die Samples bis zum nächsten Event blockweise
+per get_samples aus dem Synth und schreibt sie direkt in eine WAV-Datei
+(16 Bit, Stereo). Das läuft deutlich schneller als Echtzeit und braucht
+keine Soundkarte – geeignet für Batch-Jobs.
+"""
+
+import wave
+from pathlib import Path
+from typing import Iterable
+
+from b_application.build_note_events_use_case import NoteEvent
+from c_adapters.FileSystemAdapter import FileSystemAdapter
+from c_adapters.ports.audio_render_port import CounterpointAudioRenderPort
+from .config import MidiFluidSynthConfig
+from .driver import _event_folge
+from .synth import create_synth
+
+
+class FluidSynthWavRenderer(CounterpointAudioRenderPort):
+    def __init__(self, project_root: Path, cfg: MidiFluidSynthConfig | None = None,
+                 fs: FileSystemAdapter | None = None) -> None:
+        self.project_root = project_root
+        self.cfg = cfg or MidiFluidSynthConfig()
+        # Geschrieben wird atomar: eine abgebrochene Ausgabe hinterlässt keine halbe WAV-Datei
+        self.fs = fs or FileSystemAdapter(project_root)
+
+    @staticmethod
+    def _rendern(fl, wav: wave.Wave_write, von: int, bis: int, block: int) -> int:
+        """Schreibt die Frames [von, bis) in Blöcken von höchstens `block` Frames."""
+        import fluidsynth
+
+        while von < bis:
+            n = min(block, bis - von)
+            wav.writeframesraw(fluidsynth.raw_audio_string(fl.get_samples(n)))
+            von += n
+        return von
+
+    # --- Port-Implementierung ---
+    def render(self, events: Iterable[NoteEvent], out_path: Path) -> Path:
+        settings = self.cfg.to_settings()
+        block = max(1, settings.render_block_frames)
+        frames_per_tick = settings.samplerate * settings.tick_seconds
+        fl = create_synth(self.project_root, self.cfg, settings)
+        try:
+            with self.fs.open_atomic(out_path, "wb") as raw, wave.open(raw, "wb") as wav:
+                wav.setnchannels(2)  # get_samples liefert Stereo, interleaved
+                wav.setsampwidth(2)  # 16 Bit
+                wav.setframerate(int(settings.samplerate))
+                frame = 0
+                for tick, on, pitch in _event_folge(events):
+                    # Bis zum Event-Zeitpunkt rendern, dann das Event an den Synth geben
+                    frame = self._rendern(fl, wav, frame, round(tick * frames_per_tick), block)
+                    if on:
+                        fl.noteon(0, pitch, settings.midi_velocity)
+                    else:
+                        fl.noteoff(0, pitch)
+                # Ausklang
+                ausklang = round(max(0.0, settings.fadeout_seconds) * settings.samplerate)
+                self._rendern(fl, wav, frame, frame + ausklang, block)
+        finally:
+            try:
+                fl.delete()
+            except Exception:
+                pass
+        return self.fs.resolve_path(out_path)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Gemeinsame FluidSynth-Helfer für Playback-Driver und WAV-Renderer (Driver-Schicht).
+
+Hier liegt alles, was beide Ausgabewege gleich machen: SoundFont finden,
+Synth anlegen, Preset wählen und Lautstärke setzen. Ein Audio-Treiber wird
+NICHT gestartet; das übernimmt nur der Echtzeit-Driver.
+
+`fluidsynth` wird erst beim Anlegen eines Synths importiert; das Importieren
+der Driver-Module funktioniert damit auch ohne libfluidsynth.
+"""
+
+from pathlib import Path
+
+from .config import MidiFluidSynthConfig, PlaybackSettings
+
+
+def choose_soundfont(project_root: Path, cfg: MidiFluidSynthConfig) -> str:
+    """Ermittelt den SoundFont ausschließlich aus dem paketlokalen Ordner.
+
+    Zugelassener Suchort:
+    - d_frameworks_drivers/midiFluidSynth/soundFonts/
+    """
+    pkg_sf_dir = (project_root / "d_frameworks_drivers" / "midiFluidSynth" / "soundFonts").resolve()
+
+    # Präferenz: in der Config angegebener lokale Standard (liegt ebenfalls unterhalb des Paketordners)
+    cfg_local = (project_root / cfg.sf_local_relpath).resolve()
+    if cfg_local.exists():
+        return str(cfg_local)
+
+    # Feste Kandidaten im paketlokalen Ordner
+    pkg_candidates = [
+        pkg_sf_dir / "1276-soft_tenor_sax.sf2",
+        pkg_sf_dir / "alto_sax_2.sf2",
+        pkg_sf_dir / "example.sf2",
+    ]
+    for c in pkg_candidates:
+        if c.exists():
+            return str(c)
+
+    # Nichts gefunden: klare Fehlermeldung (nur paketlokaler Ort wird unterstützt)
+    raise FileNotFoundError(
+        "Kein SoundFont gefunden. Lege eine .sf2 in d_frameworks_drivers/midiFluidSynth/soundFonts/."
+    )
+
+
+def create_synth(project_root: Path, cfg: MidiFluidSynthConfig, settings: PlaybackSettings):
+    """Legt einen Synth mit geladenem SoundFont und gewähltem Preset an (ohne Audio-Treiber)."""
+    # Lazy: die native Bibliothek wird erst geladen, wenn wirklich ein Synth gebraucht wird
+    import fluidsynth
+
+    fl = fluidsynth.Synth(samplerate=settings.samplerate, gain=settings.gain)
+
+    # SoundFont wählen und laden
+    sf_path = choose_soundfont(project_root, cfg)
+    if not Path(sf_path).exists():
+        raise FileNotFoundError(
+            f"Kein gültiger SoundFont gefunden (versucht: {sf_path}). "
+            "Lege eine .sf2 in d_frameworks_drivers/midiFluidSynth/soundFonts/."
+        )
+    sfid = fl.sfload(sf_path)
+
+    # Preset auswählen (erste funktionierende Kombination verwenden)
+    preset_selected = False
+    for bank, program in settings.presets:
+        try:
+            fl.program_select(0, sfid, bank, program)
+            preset_selected = True
+            break
+        except Exception:
+            print("Soundfont didnt work")
+    if not preset_selected:
+        # Fallback: GM Piano
+        try:
+            fl.program_select(0, sfid, 0, 0)
+        except Exception:
+            pass
+
+    # Lautstärke sicherheitshalber hochziehen
+    try:
+        fl.cc(0, 7, settings.cc_volume)      # CC7 Volume
+        fl.cc(0, 11, settings.cc_expression)  # CC11 Expression
+    except Exception:
+        pass
+
+    return fl
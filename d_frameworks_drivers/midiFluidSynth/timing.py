@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Timing-Telemetrie für die Echtzeit-Wiedergabe (Driver-Schicht).
+
+Der Playback-Driver hält je Event fest, wie spät es gegenüber seinem geplanten
+Zeitpunkt abgesetzt wurde; nach der Wiedergabe wird daraus ein
+PlaybackTimingReport (z. B. für Alarme bei überlasteten Abspiel-Hosts).
+"""
+
+import math
+from array import array
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class PlaybackTimingReport:
+    """Verspätungen einer Wiedergabe in Sekunden (zu frühe Events zählen als 0).
+
+    - percentiles: Perzentil (50, 90, 95, 99) -> Verspätung (Nearest-Rank)
+    - late_over_tick: Anzahl Events, die mehr als einen Tick zu spät kamen
+    """
+
+    scheduling: str
+    tick_seconds: float
+    events: int = 0
+    max_late_seconds: float = 0.0
+    mean_late_seconds: float = 0.0
+    percentiles: dict[int, float] = field(default_factory=dict)
+    late_over_tick: int = 0
+
+    PERZENTILE = (50, 90, 95, 99)
+
+    @classmethod
+    def from_lateness(cls, lateness: array, scheduling: str, tick_seconds: float) -> PlaybackTimingReport:
+        werte = sorted(max(0.0, x) for x in lateness)
+        if not werte:
+            return cls(scheduling=scheduling, tick_seconds=tick_seconds)
+        n = len(werte)
+        return cls(
+            scheduling=scheduling,
+            tick_seconds=tick_seconds,
+            events=n,
+            max_late_seconds=werte[-1],
+            mean_late_seconds=math.fsum(werte) / n,
+            percentiles={p: werte[max(0, math.ceil(p / 100 * n) - 1)] for p in cls.PERZENTILE},
+            late_over_tick=sum(1 for x in werte if x > tick_seconds),
+        )
+
+    def summary(self) -> str:
+        perz = ", ".join(f"p{p} {s * 1e3:.1f} ms" for p, s in self.percentiles.items())
+        return (
+            f"Timing ({self.scheduling}): {self.events} Events, max {self.max_late_seconds * 1e3:.1f} ms, "
+            f"Mittel {self.mean_late_seconds * 1e3:.1f} ms, {perz}; "
+            f"{self.late_over_tick} Events > 1 Tick zu spät"
+        )
@@ -17,3 +17,6 @@ class MuseScoreConfig:
     # Ausgabeverzeichnis und Dateiname
     out_dirname: str = "Kontrapunkte"
     filename_prefix: str = "wWIHNS_mitKontrapunkt_"
+
+    # Taktlänge in Achteln für den taktweisen Export (8 = 4/4)
+    ticks_per_measure: int = 8
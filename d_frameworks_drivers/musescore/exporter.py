@@ -3,16 +3,18 @@
 
 from __future__ import annotations
 
-import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import xml.etree.ElementTree as ET
+from typing import Iterable, Sequence
 
 from a_domain.Melodie import Melodie
 from c_adapters.config import AppConfig
 from c_adapters.ports.score_export_port import ScoreExportPort
 from c_adapters.FileSystemAdapter import FileSystemAdapter
 from c_adapters.MuseScoreXmlAdapter import MuseScoreXmlAdapter
+from d_frameworks_drivers.ausgabepfade import Ausgabepfade, new_run_id
 from .config import MuseScoreConfig
+from .stream_writer import MuseScoreStreamWriter
 
 
 class MuseScoreFileExporter(ScoreExportPort):
@@ -24,6 +26,18 @@ class MuseScoreFileExporter(ScoreExportPort):
     - entfernt ggf. vorhandene Platzhalter-Inhalte (z. B. <Rest>) bis zur nächsten <BarLine>,
     - fügt dort <Chord>-Knoten für die übergebene Melodie ein,
     - schreibt das Ergebnis als wohlgeformtes XML in `Kontrapunkte/`.
+
+    Das Template wird nur beim ersten Export geparst und vorbereitet: Es wird an
+    der Einfügestelle in Kopf- und Rest-Bytes zerlegt und zwischengespeichert.
+    Jeder weitere Export serialisiert nur noch die eigenen <Chord>-Knoten und
+    validiert dieses Fragment im Speicher.
+
+    `export_melodies` schreibt viele Melodien parallel aus einem Thread-Pool. Die
+    Dateinamen ergeben sich deterministisch aus Lauf-ID und Index (bzw. Schlüssel,
+    z. B. Seed); geschrieben wird atomar über den FileSystemAdapter.
+
+    `export_melody_barred` schreibt stattdessen eine korrekt in Takte geteilte
+    Partitur inkrementell über den MuseScoreStreamWriter (konstanter Speicher).
     """
 
     def __init__(self, project_root: Path, app_cfg: AppConfig,
@@ -37,53 +51,116 @@ class MuseScoreFileExporter(ScoreExportPort):
         self.fs = fs
         # XML-Adapter kapselt Template-Navigation und Knotenbau
         self.xml = xml
+        # Vorbereitetes Template: (Template-Pfad, Kopf-Bytes, Rest-Bytes)
+        self._template_cache: tuple[Path, bytes, bytes] | None = None
+        self._pfade = Ausgabepfade(fs, ms_cfg, ".mscx")
+        self._stream_writer: MuseScoreStreamWriter | None = None
 
     # --- interne Helfer ---
     def _template_path(self) -> Path:
         # Unterstützt absolute Pfade in der Config sowie relative (vom Projekt-Root aus)
         return self.fs.resolve_path(self.musescore.template_relpath)
 
-
-    def _ensure_out_dir(self) -> Path:
-        return self.fs.ensure_dir(Path(self.musescore.out_dirname))
-
-    def _build_out_path(self) -> Path:
-        name = f"{self.musescore.filename_prefix}{time.strftime('%b%d.%H-%M-%S')}.mscx"
-        return (self._ensure_out_dir() / name)
+    new_run_id = staticmethod(new_run_id)
 
     # Interne XML-Helfer wurden in den Adapter ausgelagert
 
-    # --- Port-Implementierung ---
-    def export_melody(self, melody: Melodie) -> Path:
-        # 1) Template als XML laden
+    def _template_parts(self) -> tuple[bytes, bytes]:
         template_path = self._template_path()
-        tree, root = self.xml.parse(template_path)
+        if self._template_cache is None or self._template_cache[0] != template_path:
+            # 1) Template als XML laden
+            tree, root = self.xml.parse(template_path)
 
-        # 2) Ziel-Measure finden (Standard: Staff id="1", Measure number="1")
-        measure = self.xml.find_staff_measure(root, staff_id="1", measure_number="1")
+            # 2) Ziel-Measure finden (Standard: Staff id="1", Measure number="1")
+            measure = self.xml.find_staff_measure(root, staff_id="1", measure_number="1")
 
-        # 3) Einfügepunkt nach <TimeSig>
-        insert_idx = self.xml.insertion_index_after(measure, tag_name="TimeSig")
+            # 3) Einfügepunkt nach <TimeSig>
+            insert_idx = self.xml.insertion_index_after(measure, tag_name="TimeSig")
 
-        # 3b) Vorhandene Inhalte (z. B. measure-weiter <Rest>) bis zur nächsten <BarLine> entfernen
-        self.xml.clear_until_barline(measure, insert_idx)
+            # 3b) Vorhandene Inhalte (z. B. measure-weiter <Rest>) bis zur nächsten <BarLine> entfernen
+            self.xml.clear_until_barline(measure, insert_idx)
 
-        # 4) Chord-Elemente aus Melodie erzeugen
-        chord_elements = self.xml.make_chords(self.app_cfg.score_duration_map, melody.notenliste)
+            # 3c) Sicherstellen, dass eine BarLine am Measure-Ende existiert
+            self.xml.ensure_barline(measure, subtype="5")
 
-        # 5) Einfügen in richtiger Reihenfolge
-        for offset, element in enumerate(chord_elements):
-            measure.insert(insert_idx + offset, element)
+            # 3d) An der Einfügestelle zerlegen und zwischenspeichern
+            kopf, rest = self.xml.split_at(root, measure, insert_idx)
+            self._template_cache = (template_path, kopf, rest)
+        return self._template_cache[1], self._template_cache[2]
 
-        # 5b) Sicherstellen, dass eine BarLine am Measure-Ende existiert
-        self.xml.ensure_barline(measure, subtype="5")
+    def clear_template_cache(self) -> None:
+        """Verwirft das vorbereitete Template (z. B. nach Änderung der Template-Datei)."""
+        self._template_cache = None
+        self._stream_writer = None
 
-        # 6) Schreiben (Verzeichnis sicherstellen)
-        out_path = self._build_out_path()
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        self.xml.write(tree, out_path)
+    def _writer(self) -> MuseScoreStreamWriter:
+        if self._stream_writer is None:
+            self._stream_writer = MuseScoreStreamWriter(
+                self._template_path(), self.app_cfg.score_duration_map,
+                ticks_per_measure=self.musescore.ticks_per_measure,
+            )
+        return self._stream_writer
 
-        # 7) Wohlgeformtheit validieren
-        ET.parse(out_path)
+    def _melody_bytes(self, melody: Melodie) -> bytes:
+        kopf, rest = self._template_parts()
 
-        return out_path
+        # 4) Chord-Elemente aus Melodie erzeugen und serialisieren
+        chord_elements = self.xml.make_chords(self.app_cfg.score_duration_map, melody.notenliste)
+        fragment = self.xml.serialize_elements(chord_elements)
+
+        # 5) Wohlgeformtheit im Speicher validieren (Kopf und Rest stammen aus einem
+        #    wohlgeformten Dokument und sind an einer Elementgrenze getrennt)
+        self.xml.validate_fragment(fragment)
+
+        return kopf + fragment + rest
+
+    def _write_melody(self, melody: Melodie, out_path: Path) -> Path:
+        # Atomar schreiben (Verzeichnis wird bei Bedarf angelegt)
+        return self.fs.write_bytes(out_path, self._melody_bytes(melody))
+
+    # --- Port-Implementierung ---
+    def export_melody(self, melody: Melodie) -> Path:
+        # Erst erzeugen und validieren, dann den Namen vergeben
+        daten = self._melody_bytes(melody)
+        return self._pfade.einzeln_schreiben(lambda out: out.write(daten))
+
+    def export_melody_barred(self, melody: Melodie, choral: Melodie,
+                             out_path: Path | None = None) -> Path:
+        """Exportiert Melodie (Staff 1) und den zugehörigen Choral (Staff 2) Takt für Takt.
+
+        Die Datei wird direkt in eine temporäre Datei gestreamt und erst danach
+        atomar an ihren Platz verschoben.
+        """
+        staves = [melody.notenliste, choral.notenliste]
+        if out_path is None:
+            return self._pfade.einzeln_schreiben(lambda out: self._writer().write(out, staves), "w", "utf-8")
+        with self.fs.open_atomic(out_path, "w", encoding="utf-8") as out:
+            self._writer().write(out, staves)
+        return self.fs.resolve_path(out_path)
+
+    def export_score(self, choral: Melodie, melody: Melodie, run_id: str | None = None,
+                     key: object | None = None) -> Path:
+        # Das Template enthält nur wWIHNS_1; beliebige Choräle gehen über den taktweisen Writer
+        out_path = self._pfade.lauf(run_id or self.new_run_id(), key) if key is not None else None
+        return self.export_melody_barred(melody, choral, out_path=out_path)
+
+    def export_melodies(self, melodies: Iterable[Melodie], run_id: str | None = None,
+                        keys: Sequence[object] | None = None,
+                        max_workers: int | None = None) -> list[Path]:
+        """Exportiert viele Melodien parallel; Pfade in Eingabereihenfolge.
+
+        Dateiname: `<prefix><run_id>_<key>.mscx`, wobei `key` standardmäßig der
+        fünfstellige Index ist (alternativ z. B. der Seed des Laufs).
+        """
+        melodies = list(melodies)
+        if keys is None:
+            keys = [f"{i:05d}" for i in range(len(melodies))]
+        elif len(keys) != len(melodies) or len(set(keys)) != len(keys):
+            raise ValueError("keys muss je Melodie genau einen eindeutigen Schlüssel enthalten")
+        run_id = run_id or self.new_run_id()
+        out_paths = [self._pfade.lauf(run_id, key) for key in keys]
+
+        # Template einmal vorab vorbereiten, statt es in den Threads parallel zu laden
+        self._template_parts()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(self._write_melody, melodies, out_paths))
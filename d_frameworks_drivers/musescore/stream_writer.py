@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+"""Inkrementeller .mscx-Writer mit Taktstrichen (Driver-Schicht).
+
+Im Gegensatz zum Template-Export (alles in Measure 1 von Staff 1) schreibt dieser
+Writer die Partitur Takt für Takt direkt in einen Textstrom:
+- Kopf und Schluss stammen aus dem Template, die Taktart wird auf
+  `ticks_per_measure` Achtel (Standard 4/4) umgestellt,
+- Noten werden an Taktgrenzen geteilt und mit Haltebögen (<Tie>) verbunden,
+- nicht darstellbare Längen (z. B. 5 Achtel) werden in darstellbare zerlegt,
+- unvollständige Takte am Ende werden mit Pausen aufgefüllt,
+- jede Note erhält ihre Schreibweise (<tpc>) wie im Template in F-Dur.
+
+Gepuffert wird jeweils nur ein Takt; der Speicherbedarf ist damit unabhängig von
+der Länge des Stücks.
+"""
+
+import math
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence, TextIO
+
+_SIGLIST = re.compile(r'(<sig tick="0">\s*<nom>)\d+(</nom>\s*<denom>)\d+(</denom>)')
+_KEYSIG = re.compile(r"<KeySig>.*?</KeySig>", re.DOTALL)
+
+
+def _tpc(pitch: int) -> int:
+    """Tonale Tonhöhenklasse (<tpc>, Position im Quintenzirkel, C = 14) in F-Dur.
+
+    Die Töne von f_dur liegen zwischen B (12) und E (18); leiterfremde Töne
+    werden wie das b der Tonart erniedrigt geschrieben (Des statt Cis).
+    """
+    quinten = pitch * 7 % 12  # Quinten über C, 0..11
+    if quinten > 5:
+        quinten -= 12
+    return 14 + quinten
+
+
+class MuseScoreStreamWriter:
+    def __init__(self, template_path: Path, score_duration_map: dict[int, tuple[str, str]],
+                 ticks_per_measure: int = 8) -> None:
+        self.template_path = template_path
+        self.score_duration_map = score_duration_map
+        self.ticks_per_measure = ticks_per_measure
+        # Darstellbare Längen, größte zuerst (für die Zerlegung)
+        self._laengen = sorted(score_duration_map, reverse=True)
+        self._template_teile: tuple[str, str, str] | None = None
+
+    # --- Template ---
+    def _teile(self) -> tuple[str, str, str]:
+        """(Kopf bis vor <Staff id="1">, KeySig-Block, Schluss nach dem letzten </Staff>)."""
+        if self._template_teile is None:
+            text = self.template_path.read_text(encoding="utf-8")
+            start = text.index('<Staff id="1">')
+            start = text.rindex("\n", 0, start) + 1
+            ende = text.rindex("</Staff>") + len("</Staff>")
+            ende = text.index("\n", ende) + 1
+            # Taktart in der siglist: ticks_per_measure Achtel = nom/denom
+            nom, denom = self._taktart()
+            kopf = _SIGLIST.sub(rf"\g<1>{nom}\g<2>{denom}\g<3>", text[:start], count=1)
+            keysig = _KEYSIG.search(text, start)
+            self._template_teile = (kopf, keysig.group(0) if keysig else "", text[ende:])
+        return self._template_teile
+
+    def _taktart(self) -> tuple[int, int]:
+        # 1 Tick = Achtel; gerade Taktlängen werden als Vierteltakt notiert (8 -> 4/4)
+        if self.ticks_per_measure % 2 == 0:
+            return self.ticks_per_measure // 2, 4
+        return self.ticks_per_measure, 8
+
+    def _timesig(self) -> str:
+        nom, denom = self._taktart()
+        # MuseScore 1.x kodiert die Taktart im subtype als (Zähler << 6) | Nenner
+        return (
+            "<TimeSig>\n"
+            f"        <subtype>{(nom << 6) | denom}</subtype>\n"
+            f"        <den>{denom}</den>\n"
+            f"        <nom1>{nom}</nom1>\n"
+            "        </TimeSig>"
+        )
+
+    # --- Zerlegung ---
+    def _zerlegen(self, dauer: int) -> list[int]:
+        teile = []
+        while dauer > 0:
+            laenge = next((l for l in self._laengen if l <= dauer), 1)
+            teile.append(laenge)
+            dauer -= laenge
+        return teile
+
+    def _duration_xml(self, laenge: int) -> str:
+        duration_type, dots_xml = self.score_duration_map.get(laenge, ("quarter", ""))
+        return f"{dots_xml}<durationType>{duration_type}</durationType>"
+
+    def _takte(self, noten: Iterable[tuple[int, int]], anzahl_takte: int) -> Iterator[list[str]]:
+        """Liefert je Takt die XML-Zeilen der Chords/Rests (nur ein Takt im Speicher)."""
+        tie_id = 0
+        takt: list[str] = []
+        im_takt = 0  # bereits gefüllte Ticks im aktuellen Takt
+        geliefert = 0
+        for pitch, dauer in noten:
+            while dauer > 0:
+                # Bis zur nächsten Taktgrenze, zerlegt in darstellbare Längen
+                teil = min(dauer, self.ticks_per_measure - im_takt)
+                for laenge in self._zerlegen(teil):
+                    dauer -= laenge
+                    im_takt += laenge
+                    tie = ""
+                    if dauer > 0:
+                        # Haltebogen zum nächsten Stück derselben Note (auch über den Taktstrich)
+                        tie_id += 1
+                        tie = f'<Tie id="{tie_id}"></Tie>'
+                    takt.append(
+                        f"<Chord>{self._duration_xml(laenge)}<Note>{tie}"
+                        f"<pitch>{pitch}</pitch><tpc>{_tpc(pitch)}</tpc></Note></Chord>"
+                    )
+                if im_takt == self.ticks_per_measure:
+                    yield takt
+                    geliefert += 1
+                    takt, im_takt = [], 0
+        if takt:
+            fehlend = self.ticks_per_measure - im_takt
+            takt.extend(f"<Rest>{self._duration_xml(laenge)}</Rest>" for laenge in self._zerlegen(fehlend))
+            yield takt
+            geliefert += 1
+        while geliefert < anzahl_takte:
+            yield ["<Rest><durationType>measure</durationType></Rest>"]
+            geliefert += 1
+
+    # --- Schreiben ---
+    def write(self, out: TextIO, staves: Sequence[Iterable[tuple[int, int]]]) -> None:
+        """Schreibt die Partitur nach `out`; `staves` in der Part-Reihenfolge des Templates.
+
+        Jede Stimme wird zweimal durchlaufen (Länge, dann Noten) und muss daher
+        eine Sequenz sein, z. B. `Melodie.notenliste`.
+        """
+        kopf, keysig, schluss = self._teile()
+        anzahl_parts = kopf.count("<Part>")
+        if anzahl_parts and len(staves) != anzahl_parts:
+            raise ValueError(f"Das Template erwartet {anzahl_parts} Stimmen, übergeben wurden {len(staves)}")
+        laenge = max((sum(dauer for _, dauer in noten) for noten in staves), default=0)
+        anzahl_takte = max(1, math.ceil(laenge / self.ticks_per_measure))
+        timesig = self._timesig()
+
+        out.write(kopf)
+        for staff_id, noten in enumerate(staves, start=1):
+            out.write(f'  <Staff id="{staff_id}">\n')
+            for nummer, takt in enumerate(self._takte(noten, anzahl_takte), start=1):
+                out.write(f'    <Measure number="{nummer}">\n')
+                if nummer == 1:
+                    out.write(f"      {keysig}\n      {timesig}\n")
+                for zeile in takt:
+                    out.write(f"      {zeile}\n")
+                if nummer == anzahl_takte:
+                    out.write("      <BarLine>\n        <subtype>5</subtype>\n        </BarLine>\n")
+                out.write("      </Measure>\n")
+            out.write("    </Staff>\n")
+        out.write(schluss)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Backjumping der klassischen Suche gegen das frühere Backtracking (GenerateCounterpointUseCase)."""
+
+import contextlib
+import io
+import unittest
+from random import Random
+
+from a_domain.Melodie import Melodie
+from a_domain.Tonleitern import f_dur
+from b_application.generate_counterpoint_use_case import GenerateCounterpointUseCase
+from b_application.search_budget import STATUS_OK, SearchBudget
+from c_adapters.config import AppConfig
+
+# Kleine Choräle mit Klausel; der erste hat keinen regelkonformen Kontrapunkt.
+OHNE_LOESUNG = [(60, 1), (55, 8), (55, 2), (53, 8)]
+MIT_LOESUNG = [
+    [(60, 2), (55, 8), (55, 2), (53, 8)],
+    [(53, 4), (57, 4), (55, 4), (53, 8)],
+    [(57, 4), (60, 4), (62, 4), (60, 8)],
+    [(60, 1), (55, 2), (53, 8)],
+]
+
+# Ausgabe vor Einführung des Backjumpings für wWIHNS_1 und Random(seed)
+ERWARTET_OHNE_BACKJUMPING = {
+    0: [(65, 4), (62, 4), (60, 6), (58, 2), (62, 2), (50, 3), (48, 2), (52, 2), (50, 2), (62, 2), (60, 2),
+        (60, 2), (58, 1), (65, 3), (64, 2), (62, 1), (60, 2), (55, 4), (53, 1), (57, 2), (55, 2), (62, 2),
+        (55, 2), (52, 1), (52, 1), (60, 2), (67, 1), (62, 1), (50, 2), (53, 1), (52, 8), (50, 6), (57, 4),
+        (60, 3), (48, 2), (50, 1), (50, 8), (53, 1), (65, 1), (64, 2), (64, 4), (65, 8)],
+    1: [(65, 2), (69, 1), (65, 1), (65, 4), (64, 8), (62, 2), (50, 4), (55, 2), (62, 1), (60, 1), (53, 1),
+        (65, 1), (65, 8), (62, 4), (55, 6), (53, 4), (52, 2), (55, 2), (67, 2), (69, 3), (57, 2), (55, 1),
+        (53, 1), (65, 2), (64, 1), (64, 3), (69, 2), (64, 2), (62, 1), (60, 3), (58, 2), (65, 1), (64, 6),
+        (65, 3), (67, 1), (69, 1), (65, 2), (64, 1), (69, 2), (57, 2), (64, 2), (64, 4), (65, 8)],
+}
+
+
+def _still(funktion, *args, **kwargs):
+    # Diagnoseausgaben der Suche unterdrücken
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funktion(*args, **kwargs)
+
+
+class BackjumpingTest(unittest.TestCase):
+    def _backjumping_loest(self, noten):
+        try:
+            _still(GenerateCounterpointUseCase().execute, Melodie(list(noten), f_dur), rng=Random(0))
+        except ValueError:
+            return False
+        return True
+
+    def _backtracking_loest(self, noten):
+        # Das frühere Verfahren terminiert ohne Lösung nicht; daher mit Budget und mehreren Seeds
+        uc = GenerateCounterpointUseCase(backjumping=False)
+        budget = SearchBudget(max_get_contra_calls=5000, relax=False)
+        return any(
+            _still(uc.execute_budgeted, Melodie(list(noten), f_dur), rng=Random(seed), budget=budget).status
+            == STATUS_OK
+            for seed in range(5)
+        )
+
+    def test_loest_genau_wenn_backtracking_loest(self):
+        for noten in [OHNE_LOESUNG] + MIT_LOESUNG:
+            with self.subTest(noten=noten):
+                self.assertEqual(self._backjumping_loest(noten), self._backtracking_loest(noten))
+        self.assertFalse(self._backjumping_loest(OHNE_LOESUNG))
+
+    def test_ohne_loesung_und_budget_valueerror(self):
+        with self.assertRaises(ValueError):
+            _still(GenerateCounterpointUseCase().execute, Melodie(list(OHNE_LOESUNG), f_dur), rng=Random(0))
+
+    def test_ohne_backjumping_wie_vorher(self):
+        uc = GenerateCounterpointUseCase(backjumping=False)
+        for seed, erwartet in ERWARTET_OHNE_BACKJUMPING.items():
+            with self.subTest(seed=seed):
+                kontrapunkt = _still(uc.execute, Melodie(list(AppConfig.wWIHNS_1), f_dur), rng=Random(seed))
+                self.assertEqual(list(kontrapunkt.notenliste), erwartet)
+
+
+if __name__ == "__main__":
+    unittest.main()
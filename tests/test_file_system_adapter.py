@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Eindeutige Dateinamen (FileSystemAdapter.write_unique) bei Fehlern und gleichzeitigen Exporten."""
+
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from c_adapters.FileSystemAdapter import FileSystemAdapter
+
+
+class WriteUniqueTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.verzeichnis = Path(self.tmp.name)
+        self.fs = FileSystemAdapter(self.verzeichnis, fsync=False)
+
+    def test_fehler_hinterlaesst_keine_datei(self):
+        def schreiben(out):
+            out.write(b"halb")
+            raise RuntimeError("Export gescheitert")
+
+        with self.assertRaises(RuntimeError):
+            self.fs.write_unique(self.verzeichnis, "export", ".mid", schreiben)
+        self.assertEqual(list(self.verzeichnis.iterdir()), [])
+
+    def test_gleichzeitig_eindeutige_namen(self):
+        def export(i):
+            return self.fs.write_unique(self.verzeichnis, "export", ".mid", lambda out: out.write(b"%d" % i))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            pfade = list(pool.map(export, range(20)))
+
+        self.assertEqual(len(set(pfade)), 20)
+        self.assertEqual(sorted(self.verzeichnis.iterdir()), sorted(pfade))
+        self.assertEqual(sorted(int(p.read_bytes()) for p in pfade), list(range(20)))
+        self.assertIn(self.verzeichnis / "export.mid", pfade)
+        self.assertIn(self.verzeichnis / "export-20.mid", pfade)
+
+
+if __name__ == "__main__":
+    unittest.main()
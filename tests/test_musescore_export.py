@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Template-Export (MuseScoreFileExporter) gegen das frühere Einfügen in den geparsten Baum."""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from random import Random
+
+from a_domain.Melodie import Melodie
+from a_domain.Tonleitern import f_dur
+from b_application.generate_counterpoint_use_case import GenerateCounterpointUseCase
+from c_adapters.config import AppConfig
+from c_adapters.FileSystemAdapter import FileSystemAdapter
+from c_adapters.MuseScoreXmlAdapter import MuseScoreXmlAdapter
+from d_frameworks_drivers.musescore.config import MuseScoreConfig
+from d_frameworks_drivers.musescore.exporter import MuseScoreFileExporter
+
+PROJEKT = Path(__file__).resolve().parent.parent
+
+
+def _export_wie_frueher(xml, template_path, score_duration_map, notenliste, out_path):
+    """Früherer Weg: Template je Export parsen, Chords in den Baum einfügen, Baum schreiben."""
+    tree, root = xml.parse(template_path)
+    measure = xml.find_staff_measure(root, staff_id="1", measure_number="1")
+    insert_idx = xml.insertion_index_after(measure, tag_name="TimeSig")
+    xml.clear_until_barline(measure, insert_idx)
+    for offset, element in enumerate(xml.make_chords(score_duration_map, notenliste)):
+        measure.insert(insert_idx + offset, element)
+    xml.ensure_barline(measure, subtype="5")
+    xml.write(tree, out_path)
+
+
+class TemplateExportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.app_cfg = AppConfig()
+        ms_cfg = MuseScoreConfig()
+        ms_cfg.out_dirname = self.tmp.name
+        self.xml = MuseScoreXmlAdapter()
+        self.exporter = MuseScoreFileExporter(
+            project_root=PROJEKT, app_cfg=self.app_cfg, ms_cfg=ms_cfg,
+            fs=FileSystemAdapter(PROJEKT, fsync=False), xml=self.xml,
+        )
+
+    def test_byte_gleich_wie_frueher(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            kontrapunkt = GenerateCounterpointUseCase().execute(
+                Melodie(list(AppConfig.wWIHNS_1), f_dur), rng=Random(0)
+            )
+        melodien = [
+            kontrapunkt,
+            Melodie([(65, 1), (64, 3), (62, 6), (60, 5), (65, 8)], f_dur),  # punktierte und unbekannte Längen
+            Melodie([], f_dur),
+        ]
+        # Mehrere Exporte nacheinander: der zwischengespeicherte Kopf/Rest darf sich nicht verändern
+        for nummer, melodie in enumerate(melodien):
+            with self.subTest(melodie=melodie.notenliste):
+                neu = self.exporter.export_melody(melodie)
+                alt = Path(self.tmp.name) / f"alt_{nummer}.mscx"
+                _export_wie_frueher(self.xml, self.exporter._template_path(),
+                                    self.app_cfg.score_duration_map, melodie.notenliste, alt)
+                self.assertEqual(neu.read_bytes(), alt.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
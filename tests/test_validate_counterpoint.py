@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Vektorisierter Validator gegen die Regeln der Suche (KpRegeln über Vorwaertspruefung)."""
+
+import unittest
+from random import Random
+
+from a_domain.ChoralGenerator import ChoralGenerator
+from a_domain.Melodie import Melodie
+from a_domain.Tonleitern import f_dur
+from b_application.forward_checking_use_case import GenerateCounterpointForwardCheckingUseCase
+from c_adapters.config import AppConfig
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    numpy = None
+
+
+def _chorale():
+    rng = Random(0)
+    yield list(AppConfig.wWIHNS_1)
+    for i in range(5):
+        yield list(ChoralGenerator(rng.randint(6, 20), rng=Random(i)).erzeugen())
+
+
+def _regelkonform(pruefung, noten):
+    """Ob die Vorwärtsprüfung jeden Schritt des vollständigen Kontrapunkts zulässt."""
+    if noten[0][0] not in pruefung.start_toene():
+        return False
+    einsatz = 0
+    for (ton, dauer), (folgeton, _) in zip(noten, noten[1:]):
+        if not any(d == dauer and folgeton in folgetoene for d, folgetoene in pruefung.uebergaenge(einsatz, ton)):
+            return False
+        einsatz += dauer
+    return True
+
+
+@unittest.skipUnless(numpy, "numpy ist nicht installiert")
+class ValidateCounterpointTest(unittest.TestCase):
+    def setUp(self):
+        from b_application.validate_counterpoint_use_case import ValidateCounterpointUseCase
+
+        self.validator = ValidateCounterpointUseCase()
+        self.forward = GenerateCounterpointForwardCheckingUseCase()
+
+    def test_erzeugte_kontrapunkte_ohne_verstoss(self):
+        paare = [
+            (Melodie(noten, f_dur), self.forward.execute(Melodie(list(noten), f_dur), rng=Random(seed)))
+            for noten in _chorale() for seed in range(3)
+        ]
+        self.assertEqual(self.validator.execute_batch(paare), [[] for _ in paare])
+
+    def test_gleich_wie_vorwaertspruefung(self):
+        # Tonhöhen im Inneren verändern; Rhythmus, Anfang und Klausel bleiben, so dass nur
+        # die Regeln entscheiden, die beide Seiten prüfen
+        rng = Random(1)
+        ergebnisse = set()
+        for noten in _chorale():
+            choral = Melodie(noten, f_dur)
+            pruefung = self.forward.pruefung(choral)
+            for seed in range(3):
+                kontrapunkt = list(self.forward.execute(Melodie(list(noten), f_dur), rng=Random(seed)).notenliste)
+                for _ in range(10):
+                    mutiert = list(kontrapunkt)
+                    for _ in range(rng.randint(1, 2)):
+                        i = rng.randint(1, len(mutiert) - 3)
+                        mutiert[i] = (rng.choice(f_dur[1:]), mutiert[i][1])
+                    erwartet = _regelkonform(pruefung, mutiert)
+                    with self.subTest(choral=noten, kontrapunkt=mutiert):
+                        self.assertEqual(not self.validator.execute(choral, mutiert), erwartet)
+                    ergebnisse.add(erwartet)
+        # Beide Fälle müssen vorkommen, sonst sagt der Vergleich nichts
+        self.assertEqual(ergebnisse, {True, False})
+
+
+if __name__ == "__main__":
+    unittest.main()